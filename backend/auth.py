@@ -1,7 +1,11 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
 import logging
 import os
+import threading
+import time
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -38,11 +42,52 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
 # Long lived refresh token (e.g. 7 days)
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Verified-token cache (opt-in): seconds a verified token is trusted before its
+# signature is checked again; 0 (default) verifies every token from scratch
+AUTH_JWT_CACHE_TTL = int(os.getenv("AUTH_JWT_CACHE_TTL", "0"))
+# Maximum number of cached tokens while the cache is enabled
+JWT_DECODE_CACHE_SIZE = int(os.getenv("JWT_DECODE_CACHE_SIZE", "1024"))
+
+# Argon2 cost parameters (defaults are passlib's); only lower them for tests/CI
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Remember successful password verifications in-process (tests/CI only; off by default)
+AUTH_VERIFY_CACHE = os.getenv("AUTH_VERIFY_CACHE", "0") == "1"
+AUTH_VERIFY_CACHE_SIZE = 256
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# sha256(plain, hash) digests of verifications that succeeded; LRU-ordered
+_verified_passwords: "OrderedDict[bytes, None]" = OrderedDict()
+_verified_passwords_lock = threading.Lock()
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    if not AUTH_VERIFY_CACHE:
+        return pwd_context.verify(plain_password, hashed_password)
+    
+    key = hashlib.sha256(f"{plain_password}\0{hashed_password}".encode()).digest()
+    with _verified_passwords_lock:
+        if key in _verified_passwords:
+            _verified_passwords.move_to_end(key)
+            return True
+    
+    # Failures are never cached, so wrong guesses always pay the full hash cost
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+    with _verified_passwords_lock:
+        _verified_passwords[key] = None
+        while len(_verified_passwords) > AUTH_VERIFY_CACHE_SIZE:
+            _verified_passwords.popitem(last=False)
+    return True
 
 def get_password_hash(password):
     return pwd_context.hash(password)
@@ -69,6 +114,40 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# sha256(secret, token) -> (payload, verified_at); LRU-ordered, bounded by JWT_DECODE_CACHE_SIZE
+_verified_tokens: "OrderedDict[bytes, tuple]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+def _decode_supabase_token(token: str, secret: str) -> dict:
+    """
+    Verifies and decodes a Supabase access token.
+    When AUTH_JWT_CACHE_TTL is set, cached on a digest of the token so a client reusing
+    one token is only verified once per TTL; invalid tokens raise and are never cached.
+    Expiry is re-checked by the caller.
+    """
+    if AUTH_JWT_CACHE_TTL <= 0 or JWT_DECODE_CACHE_SIZE <= 0:
+        return jwt.decode(token, secret, algorithms=["HS256"], audience="authenticated")
+    
+    key = hashlib.sha256(f"{secret}\0{token}".encode()).digest()
+    now = time.monotonic()
+    
+    with _verified_tokens_lock:
+        entry = _verified_tokens.get(key)
+        if entry is not None:
+            if now - entry[1] < AUTH_JWT_CACHE_TTL:
+                _verified_tokens.move_to_end(key)
+                return entry[0]
+            del _verified_tokens[key]
+    
+    # Supabase tokens use HS256 and have 'authenticated' audience
+    payload = jwt.decode(token, secret, algorithms=["HS256"], audience="authenticated")
+    
+    with _verified_tokens_lock:
+        _verified_tokens[key] = (payload, now)
+        while len(_verified_tokens) > JWT_DECODE_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,8 +163,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
 
     try:
         # Verify Supabase Token
-        # Supabase tokens use HS256 and have 'authenticated' audience
-        payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"], audience="authenticated")
+        payload = _decode_supabase_token(token, SUPABASE_JWT_SECRET)
+        # A cached payload may have expired since it was first verified
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            raise credentials_exception
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         
@@ -96,7 +178,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         raise credentials_exception
 
     # Query User by ID (UUID)
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    # get() answers from the session's identity map if the user is already loaded
+    user = db.get(models.User, user_id)
     
     if user is None:
         # Optional: Auto-create user record if they exist in Auth but not in public.users?
@@ -89,5 +89,24 @@ def run_migrations(engine: Engine):
                         except Exception as e:
                             logger.error(f"Failed to add column {col_name}: {e}")
 
+        # --- transactions indexes ---
+        if "transactions" in table_names:
+            existing_indexes = {i["name"] for i in inspector.get_indexes("transactions")}
+            
+            indexes_to_add = [
+                ("idx_transactions_user_date", "user_id, date"),
+                ("idx_transactions_user_bucket_date", "user_id, bucket_id, date"),
+            ]
+            
+            with engine.connect() as conn:
+                for index_name, index_cols in indexes_to_add:
+                    if index_name not in existing_indexes:
+                        logger.info(f"Auto-Migration: Creating index '{index_name}' on 'transactions' table...")
+                        try:
+                             conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON transactions ({index_cols})"))
+                             conn.commit()
+                        except Exception as e:
+                            logger.error(f"Failed to create index {index_name}: {e}")
+
     except Exception as e:
         logger.error(f"Migration check failed: {e}")
@@ -88,6 +88,35 @@ def cached(prefix: str, ttl: int = 300):
     return decorator
 
 
+def cache_get(key: str) -> Optional[Any]:
+    """Get a cached JSON value, or None on a miss or if Redis is unavailable."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    
+    try:
+        cached_value = redis.get(key)
+        if cached_value is not None:
+            logger.debug(f"Cache hit: {key}")
+            return json.loads(cached_value)
+    except Exception as e:
+        logger.warning(f"Cache error: {e}")
+    return None
+
+
+def cache_set(key: str, value: Any, ttl: int = 300):
+    """Store a JSON-serializable value; a no-op if Redis is unavailable."""
+    redis = get_redis()
+    if redis is None:
+        return
+    
+    try:
+        redis.setex(key, ttl, json.dumps(value, default=str))
+        logger.debug(f"Cache set: {key}")
+    except Exception as e:
+        logger.warning(f"Cache error: {e}")
+
+
 def invalidate_cache(pattern: str):
     """
     Invalidate all cache keys matching a pattern.
@@ -133,3 +162,13 @@ class CacheManager:
         """Invalidate transaction-related caches for a user."""
         invalidate_cache(f"txn:*:{user_id}:*")
         invalidate_cache(f"analytics:*:{user_id}:*")
+    
+    @staticmethod
+    def user_buckets_key(user_id) -> str:
+        """Cache key for a user's bucket list."""
+        return f"{CacheManager.PREFIX_BUCKETS}:{user_id}"
+    
+    @staticmethod
+    def invalidate_user_buckets(user_id=None):
+        """Invalidate a user's cached bucket list, or every user's if user_id is None."""
+        invalidate_cache(CacheManager.user_buckets_key("*" if user_id is None else user_id))
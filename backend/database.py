@@ -28,12 +28,14 @@ else:
     if "supabase.co" in SQLALCHEMY_DATABASE_URL or "sslmode=require" in SQLALCHEMY_DATABASE_URL:
         connect_args["sslmode"] = "require"
     
+    # Pool sizing is tunable per deployment; defaults suit the API plus
+    # short-lived sessions opened by scripts and smoke tests.
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
         pool_pre_ping=True,
-        pool_recycle=300,
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
         connect_args=connect_args
     )
     logger.info("Using PostgreSQL database (production mode)")
@@ -46,6 +46,7 @@ else:
     logger.info("ℹ️  Sentry not configured (set SENTRY_DSN to enable error monitoring)")
 
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -53,6 +54,13 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+# Optional: orjson serializes responses several times faster than stdlib json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponseClass
+except ImportError:
+    DefaultResponseClass = JSONResponse
+
 from .database import engine, Base
 from .routers import (
     settings, ingestion, transactions, analytics,
@@ -72,6 +80,7 @@ run_migrations(engine)
 limiter = Limiter(key_func=get_remote_address)
 
 app = FastAPI(
+    default_response_class=DefaultResponseClass,
     title="Principal Finance API",
     description="""
 ## Personal Finance Management API
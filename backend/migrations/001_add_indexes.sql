@@ -5,6 +5,10 @@
 CREATE INDEX IF NOT EXISTS idx_transactions_user_date 
 ON transactions(user_id, date DESC);
 
+-- Composite index for per-category date range queries
+CREATE INDEX IF NOT EXISTS idx_transactions_user_bucket_date 
+ON transactions(user_id, bucket_id, date);
+
 -- Index for transactions by bucket (category analysis)
 CREATE INDEX IF NOT EXISTS idx_transactions_bucket 
 ON transactions(bucket_id);
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, DateTime, Date, LargeBinary, Table
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, DateTime, Date, LargeBinary, Table, Index
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
 from .database import Base
@@ -83,7 +83,12 @@ bucket_tags = Table(
 
 class Transaction(Base):
     __tablename__ = "transactions"
-    # Note: Composite indexes are created via SQL migration (001_add_indexes.sql)
+    # Composite indexes for the user + date range filters every analytics query uses.
+    # Existing databases get them from auto_migrate / 001_add_indexes.sql.
+    __table_args__ = (
+        Index("idx_transactions_user_date", "user_id", "date"),
+        Index("idx_transactions_user_bucket_date", "user_id", "bucket_id", "date"),
+    )
 
 
     id = Column(Integer, primary_key=True, index=True)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, extract, case
 from typing import List, Optional
 from datetime import datetime, timedelta, date
+import math
 import statistics
 from ..database import get_db
 from .. import models, schemas, auth
@@ -28,7 +29,8 @@ def get_dashboard_data(
     
     # 1. Get User & Buckets
     user = current_user
-    buckets = db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()
+    # Limits are summed per bucket below; load them with the buckets instead of one query each
+    buckets = db.query(models.BudgetBucket).options(joinedload(models.BudgetBucket.limits)).filter(models.BudgetBucket.user_id == user.id).all()
     
     # 2. Optimized Aggregation for Current Range
     # Query: SELECT bucket_id, SUM(amount) FROM transactions WHERE ... GROUP BY bucket_id
@@ -455,39 +457,44 @@ def get_analytics_history(
     
     logger.info(f"Optimized Limit Calc: {monthly_limit_total} across {len(relevant_buckets)} buckets")
     
+    # Monthly spend for the whole range in one GROUP BY instead of one query per month
+    range_start = datetime(s_date.year, s_date.month, 1)
+    range_end = datetime(e_date.year + 1, 1, 1) if e_date.month == 12 else datetime(e_date.year, e_date.month + 1, 1)
+    
+    query = db.query(
+        extract('year', models.Transaction.date).label('year'),
+        extract('month', models.Transaction.date).label('month'),
+        func.sum(models.Transaction.amount).label('total')
+    ).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.date >= range_start,
+        models.Transaction.date < range_end,
+        models.Transaction.amount < 0 # Only expenses
+    )
+    
+    if spender != "Combined":
+        query = query.filter(models.Transaction.spender == spender)
+    
+    if bucket_id or bucket_ids or group:
+         query = query.filter(models.Transaction.bucket_id.in_(relevant_bucket_ids))
+    
+    # Note: If no filters, we include ALL expenses to match "Total Spending" paradigm
+    
+    # Exclude Transfers from History too
+    query = query.filter(
+        ~models.Transaction.bucket.has(models.BudgetBucket.is_transfer == True)
+    )
+    
+    monthly_spent = {
+        (int(row.year), int(row.month)): row.total or 0.0
+        for row in query.group_by('year', 'month').all()
+    }
+    
     history_data = []
     
     for year, month in month_year_iter(s_date, e_date):
-        # Transaction Range for this month
         m_start = datetime(year, month, 1)
-        if month == 12:
-            m_end = datetime(year + 1, 1, 1)
-        else:
-            m_end = datetime(year, month + 1, 1)
-            
-        # Query Txns
-        query = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.user_id == user.id,
-            models.Transaction.date >= m_start,
-            models.Transaction.date < m_end,
-            models.Transaction.amount < 0 # Only expenses
-        )
-        
-        if spender != "Combined":
-            query = query.filter(models.Transaction.spender == spender)
-        
-        if bucket_id or bucket_ids or group:
-             query = query.filter(models.Transaction.bucket_id.in_(relevant_bucket_ids))
-        
-        # Note: If no filters, we include ALL expenses to match "Total Spending" paradigm
-        
-        # Exclude Transfers from History too
-        query = query.filter(
-            ~models.Transaction.bucket.has(models.BudgetBucket.is_transfer == True)
-        )
-             
-        spent = query.scalar() or 0.0
-        spent = abs(spent)
+        spent = abs(monthly_spent.get((year, month), 0.0))
         
         history_data.append({
             "date": m_start.strftime("%Y-%m-%d"),
@@ -613,29 +620,18 @@ def delete_subscription(
     db.commit()
     return {"ok": True}
 
-@router.get("/subscriptions/suggested")
-def get_suggested_subscriptions(
-    exclude_existing: bool = True,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
-):
-    user = current_user
-    # 0. Get Existing Subscriptions to filter out
-    existing_keywords = set()
-    if exclude_existing:
-        subs = db.query(models.Subscription).filter(models.Subscription.user_id == user.id).all()
-        for s in subs:
-            keyword = (s.description_keyword or s.name).lower()
-            existing_keywords.add(keyword)
+def _existing_subscription_keywords(db: Session, user: models.User) -> set:
+    keywords = set()
+    for s in db.query(models.Subscription).filter(models.Subscription.user_id == user.id).all():
+        keywords.add((s.description_keyword or s.name).lower())
+    return keywords
 
-    # 1. Fetch last 12 months of transactions
-    one_year_ago = datetime.now() - timedelta(days=365)
-    
-    all_txns = db.query(models.Transaction).filter(
-        models.Transaction.user_id == user.id,
-        models.Transaction.date >= one_year_ago
-    ).order_by(models.Transaction.date.desc()).all()
-    
+
+def _detect_subscriptions(all_txns, existing_keywords: set, exclude_existing: bool) -> list:
+    """
+    Finds recurring payments and income in all_txns (newest first).
+    Groups of 3+ with consistent amounts and a regular interval become suggestions.
+    """
     recommendations = []
     
     # Helper to process a group of transactions
@@ -719,6 +715,27 @@ def get_suggested_subscriptions(
     return recommendations
 
 
+@router.get("/subscriptions/suggested")
+def get_suggested_subscriptions(
+    exclude_existing: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    user = current_user
+    # 0. Get Existing Subscriptions to filter out
+    existing_keywords = _existing_subscription_keywords(db, user) if exclude_existing else set()
+
+    # 1. Fetch last 12 months of transactions
+    one_year_ago = datetime.now() - timedelta(days=365)
+    
+    all_txns = db.query(models.Transaction).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.date >= one_year_ago
+    ).order_by(models.Transaction.date.desc()).all()
+    
+    return _detect_subscriptions(all_txns, existing_keywords, exclude_existing)
+
+
 @router.get("/debt_projection")
 def get_debt_projection(
     current_balance: float = Query(..., gt=0),
@@ -749,20 +766,37 @@ def get_debt_projection(
                  schedule.append({"month": i+1, "balance": max(0, bal), "interest": interest, "principal": principal})
              return {"schedule": schedule, "total_interest": float('inf'), "months": float('inf')}
 
-        while bal > 0.01 and months < 360: # Cap at 30 years for safety
-            interest = bal * monthly_rate
+        # Closed-form amortization: after k payments the balance is
+        # bal * g^k - payment * (g^k - 1) / r, with g = 1 + r.
+        # Months is the first k where that drops to 0.01 or below (the old loop's stop condition).
+        growth = 1 + monthly_rate
+        if monthly_rate > 0:
+            months = math.ceil(
+                math.log((payment - 0.01 * monthly_rate) / (payment - bal * monthly_rate)) / math.log(growth)
+            )
+        else:
+            months = math.ceil((bal - 0.01) / payment)
+        months = min(max(months, 0), 360) # Cap at 30 years for safety
+        
+        # The schedule rows are still returned for the payoff chart, but each one is
+        # read off the formula (factor = g^(month - 1)) rather than carried forward
+        factor = 1.0
+        for month in range(1, months + 1):
+            if monthly_rate > 0:
+                prev_bal = bal * factor - payment * (factor - 1) / monthly_rate
+                factor *= growth
+            else:
+                prev_bal = bal - payment * (month - 1)
+            interest = prev_bal * monthly_rate
             principal = payment - interest
             
-            if bal < principal: # Final payment
-                principal = bal
-                payment = interest + principal
+            if prev_bal < principal: # Final payment
+                principal = prev_bal
             
-            bal -= principal
             total_interest += interest
-            months += 1
             schedule.append({
-                "month": months,
-                "balance": max(0, bal),
+                "month": month,
+                "balance": max(0, prev_bal - principal),
                 "interest": interest, 
                 "principal": principal
             })
@@ -782,30 +816,30 @@ def get_debt_projection(
     }
 
 
-@router.get("/anomalies")
-def get_anomalies(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
-):
-    user = current_user
-    today = datetime.now()
-    
-    # Get bucket IDs to exclude from anomaly detection (transfers and one-offs)
-    excluded_bucket_ids = [b.id for b in db.query(models.BudgetBucket).filter(
-        models.BudgetBucket.user_id == user.id,
-        (models.BudgetBucket.is_transfer == True) | (models.BudgetBucket.is_one_off == True)
-    ).all()]
+def _anomaly_history_start(today: datetime) -> datetime:
+    # Category spikes compare against roughly the last 6 whole months
+    return (today.replace(day=1) - timedelta(days=180)).replace(day=1)
+
+
+def _detect_anomalies(txns, buckets, today: datetime) -> list:
+    """
+    Flags large recent expenses and category spending spikes.
+    txns: the user's transactions since _anomaly_history_start(today)
+    buckets: all of the user's BudgetBuckets
+    """
+    # Bucket IDs to exclude from anomaly detection (transfers and one-offs)
+    excluded_bucket_ids = {b.id for b in buckets if b.is_transfer or b.is_one_off}
     
     # 1. Large Transactions (Dynamic Threshold based on last 90 days)
     ninety_days_ago = today - timedelta(days=90)
     
-    # Fetch all expenses in last 90 days (excluding transfers and one-offs)
-    recent_txns = db.query(models.Transaction).filter(
-        models.Transaction.user_id == user.id,
-        models.Transaction.date >= ninety_days_ago,
-        models.Transaction.amount < 0,
-        ~models.Transaction.bucket_id.in_(excluded_bucket_ids) if excluded_bucket_ids else True
-    ).all()
+    # All expenses in last 90 days (excluding transfers and one-offs; as with SQL NOT IN,
+    # uncategorized rows drop out whenever there is something to exclude)
+    recent_txns = [
+        t for t in txns
+        if t.date >= ninety_days_ago and t.amount < 0
+        and (not excluded_bucket_ids or (t.bucket_id is not None and t.bucket_id not in excluded_bucket_ids))
+    ]
     
     anomalies = []
     
@@ -818,6 +852,8 @@ def get_anomalies(
             # Minimum threshold of $100 to avoid noise
             large_threshold = max(200.0, mean_amt + (2 * std_amt))
         else:
+            # A single expense has no spread to measure against
+            mean_amt, std_amt = amounts[0], 0.0
             large_threshold = 500.0 # Fallback
             
         # Find large txns in last 30 days
@@ -834,15 +870,12 @@ def get_anomalies(
                 })
 
     # 2. Category Spikes (Dynamic based on last 6 months)
-    # Fetch 6 months history
-    six_months_ago = (today.replace(day=1) - timedelta(days=180)).replace(day=1)
+    six_months_ago = _anomaly_history_start(today)
     
-    hist_txns = db.query(models.Transaction).filter(
-        models.Transaction.user_id == user.id,
-        models.Transaction.date >= six_months_ago,
-        models.Transaction.bucket_id.isnot(None),
-        models.Transaction.amount < 0
-    ).all()
+    hist_txns = [
+        t for t in txns
+        if t.date >= six_months_ago and t.bucket_id is not None and t.amount < 0
+    ]
     
     # Aggregate by Bucket and Month (excluding transfers)
     bucket_monthly = {} # bid -> { 'yyyy-mm': total }
@@ -858,11 +891,11 @@ def get_anomalies(
         
     current_month_key = today.strftime("%Y-%m")
     
-    # Get Bucket Names
-    buckets = {b.id: b.name for b in db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()}
+    # Bucket Names
+    bucket_names = {b.id: b.name for b in buckets}
     
     for bid, months_data in bucket_monthly.items():
-        if bid not in buckets: continue
+        if bid not in bucket_names: continue
         
         current_val = months_data.get(current_month_key, 0.0)
         if current_val == 0: continue
@@ -891,7 +924,7 @@ def get_anomalies(
             anomalies.append({
                 "type": "category_spike",
                 "severity": "high" if current_val > (avg_val + 3 * (std_val if len(history_vals) > 1 else 0)) else "medium",
-                "message": f"High spending in '{buckets[bid]}'",
+                "message": f"High spending in '{bucket_names[bid]}'",
                 "amount": current_val,
                 "date": today,
                 "details": f"{pct}% of average. Spent ${current_val:.0f} vs typical ${avg_val:.0f}."
@@ -900,6 +933,53 @@ def get_anomalies(
     return anomalies
 
 
+@router.get("/anomalies")
+def get_anomalies(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    user = current_user
+    today = datetime.now()
+    
+    buckets = db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()
+    
+    # One fetch covers both the 90-day and the 6-month window
+    txns = db.query(models.Transaction).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.date >= _anomaly_history_start(today)
+    ).all()
+    
+    return _detect_anomalies(txns, buckets, today)
+
+
+@router.get("/insights")
+def get_insights(
+    exclude_existing: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """
+    Anomalies and suggested subscriptions together, from a single read of
+    the last 12 months of transactions.
+    """
+    user = current_user
+    today = datetime.now()
+    one_year_ago = today - timedelta(days=365)
+    
+    all_txns = db.query(models.Transaction).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.date >= one_year_ago
+    ).order_by(models.Transaction.date.desc()).all()
+    
+    buckets = db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()
+    existing_keywords = _existing_subscription_keywords(db, user) if exclude_existing else set()
+    
+    history_start = _anomaly_history_start(today)
+    return {
+        "anomalies": _detect_anomalies([t for t in all_txns if t.date >= history_start], buckets, today),
+        "subscriptions": _detect_subscriptions(all_txns, existing_keywords, exclude_existing),
+    }
+
 
 @router.get("/transactions/stats")
 def get_transaction_stats(
@@ -2125,6 +2205,18 @@ def get_group_spending(
     }
 
 
+
+# Forecast recurrence step per subscription frequency (unknown frequencies repeat every 30 days)
+FORECAST_STEP_DAYS = {"Monthly": 30, "Weekly": 7, "Bi-Weekly": 14}
+
+def _next_yearly_due(due):
+    """Same calendar day next year (29 Feb falls back to +365 days)."""
+    try:
+        return due.replace(year=due.year + 1)
+    except ValueError:
+        return due + timedelta(days=365)
+
+
 @router.get("/forecast")
 def get_cash_flow_forecast(
     days: int = 90,
@@ -2208,41 +2300,36 @@ def get_cash_flow_forecast(
     
     for sub in subscriptions:
         current_due = sub.next_due_date
+        step_days = FORECAST_STEP_DAYS.get(sub.frequency, 30)
         
         # Advance to window
-        while current_due < today:
-             if sub.frequency == "Monthly": current_due += timedelta(days=30)
-             elif sub.frequency == "Weekly": current_due += timedelta(days=7)
-             elif sub.frequency == "Bi-Weekly": current_due += timedelta(days=14)
-             elif sub.frequency == "Yearly": 
-                 try: current_due = current_due.replace(year=current_due.year + 1)
-                 except: current_due += timedelta(days=365)
-             else: current_due += timedelta(days=30)
+        if sub.frequency == "Yearly":
+            while current_due < today:
+                current_due = _next_yearly_due(current_due)
+        elif current_due < today:
+            # Fixed-length periods: jump straight to the first due date on/after today
+            periods = -(-(today - current_due).days // step_days)
+            current_due += timedelta(days=periods * step_days)
              
+        # Logic: Expense = subtract, Income = add
+        # Subscription.amount is typically positive magnitude.
+        amt = abs(sub.amount)
+        if sub.type == "Expense": amt = -amt
+        # If type is Income, amt remains positive
+        
         # Collect events
         while current_due <= end_date:
-            if current_due not in events_by_date: events_by_date[current_due] = []
-            
-            # Logic: Expense = subtract, Income = add
-            # Subscription.amount is typically positive magnitude.
-            amt = abs(sub.amount)
-            if sub.type == "Expense": amt = -amt
-            # If type is Income, amt remains positive
-            
-            events_by_date[current_due].append({
+            events_by_date.setdefault(current_due, []).append({
                 "name": sub.name,
                 "amount": amt,
                 "type": sub.type
             })
             
             # Next occurrence
-            if sub.frequency == "Monthly": current_due += timedelta(days=30)
-            elif sub.frequency == "Weekly": current_due += timedelta(days=7)
-            elif sub.frequency == "Bi-Weekly": current_due += timedelta(days=14)
-            elif sub.frequency == "Yearly":
-                 try: current_due = current_due.replace(year=current_due.year + 1)
-                 except: current_due += timedelta(days=365)
-            else: current_due += timedelta(days=30)
+            if sub.frequency == "Yearly":
+                current_due = _next_yearly_due(current_due)
+            else:
+                current_due += timedelta(days=step_days)
             
     # Simulate
     forecast_data.append({
@@ -2343,20 +2430,6 @@ def get_performance_data(
             children_map[child.parent_id] = []
         children_map[child.parent_id].append(child)
     
-    # Fetch members for spender filter
-    members = db.query(models.HouseholdMember).filter(
-        models.HouseholdMember.user_id == user.id
-    ).order_by(models.HouseholdMember.id).all()
-    
-    # Build spender mapping (legacy names to current)
-    spender_to_member = {"Joint": "Joint"}
-    legacy_names = ["User A", "User B"]
-    for i, legacy_name in enumerate(legacy_names):
-        if i < len(members):
-            spender_to_member[legacy_name] = members[i].name
-    for m in members:
-        spender_to_member[m.name] = m.name
-    
     # Fetch spend data grouped by bucket, year, month
     history_query = db.query(
         models.Transaction.bucket_id,
@@ -2377,17 +2450,6 @@ def get_performance_data(
         models.Transaction.bucket_id, 'year', 'month'
     ).all()
     
-    # Build history map: bucket_id -> {"YYYY-MM": amount}
-    bucket_history = {}
-    for bid, yr, mo, total in history_results:
-        if bid is None:
-            continue
-        if bid not in bucket_history:
-            bucket_history[bid] = {}
-        key = f"{int(yr)}-{int(mo):02d}"
-        # Invert sign: expenses are negative in DB, we want positive values
-        bucket_history[bid][key] = -total if total else 0
-    
     # Generate 12 month labels
     month_labels = []
     current = history_start
@@ -2403,6 +2465,20 @@ def get_performance_data(
         else:
             current = current.replace(month=current.month + 1)
     
+    month_index = {ml["key"]: i for i, ml in enumerate(month_labels)}
+    
+    # Pivot into month columns: bucket_id -> [amount per month], in month_labels order
+    bucket_history = {}
+    for bid, yr, mo, total in history_results:
+        if bid is None:
+            continue
+        idx = month_index.get(f"{int(yr)}-{int(mo):02d}")
+        if idx is None:
+            continue
+        # Invert sign: expenses are negative in DB, we want positive values
+        bucket_history.setdefault(bid, [0] * len(month_labels))[idx] = -total if total else 0
+    no_spend = [0] * len(month_labels)
+    
     # Fetch budget limits for all buckets
     all_limits = db.query(models.BudgetLimit).filter(
         models.BudgetLimit.bucket_id.in_(bucket_ids)
@@ -2434,10 +2510,10 @@ def get_performance_data(
         all_bucket_ids = [parent.id] + child_ids
         
         # Aggregate spend by month for parent + children
-        spend_by_month = []
-        for ml in month_labels:
-            amount = sum(bucket_history.get(bid, {}).get(ml["key"], 0) for bid in all_bucket_ids)
-            spend_by_month.append(round(amount, 2))
+        spend_by_month = [
+            round(sum(month), 2)
+            for month in zip(*(bucket_history.get(bid, no_spend) for bid in all_bucket_ids))
+        ]
         
         # Calculate average (exclude zero months for more accurate average)
         non_zero_months = [s for s in spend_by_month if s > 0]
@@ -2463,10 +2539,7 @@ def get_performance_data(
         # Build children data
         children_data = []
         for child in children:
-            child_spend_by_month = []
-            for ml in month_labels:
-                amount = bucket_history.get(child.id, {}).get(ml["key"], 0)
-                child_spend_by_month.append(round(amount, 2))
+            child_spend_by_month = [round(amount, 2) for amount in bucket_history.get(child.id, no_spend)]
             
             child_non_zero = [s for s in child_spend_by_month if s > 0]
             child_average = round(sum(child_non_zero) / len(child_non_zero), 2) if child_non_zero else 0
@@ -19,6 +19,10 @@ limiter = Limiter(key_func=get_remote_address)
 # Google OAuth Client ID (from environment variable)
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "960936173044-v5ufgg0q3hvqlh44u0g8uh70rd9lsd22.apps.googleusercontent.com")
 
+# Credential/token-guessing endpoints: 5 attempts per IP per 15-minute window,
+# so brute force is cut off before it costs an Argon2 verify per attempt
+AUTH_ATTEMPT_LIMIT = "5/15 minutes"
+
 # Token expiry settings
 PASSWORD_RESET_EXPIRE_HOURS = 1
 EMAIL_VERIFICATION_EXPIRE_HOURS = 24
@@ -273,7 +277,7 @@ def register(request: Request, user: schemas.UserCreate, db: Session = Depends(d
     return new_user
 
 @router.post("/token", response_model=schemas.Token)
-@limiter.limit("5/minute")  # Strict rate limit to prevent brute force
+@limiter.limit(AUTH_ATTEMPT_LIMIT)
 def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
     """Authenticate user and return access/refresh tokens."""
     user = db.query(models.User).filter(models.User.email == form_data.username).first()
@@ -447,7 +451,7 @@ def generate_secure_token() -> tuple[str, str]:
 
 
 @router.post("/forgot-password", response_model=schemas.MessageResponse)
-@limiter.limit("3/minute")  # Strict rate limit to prevent abuse
+@limiter.limit(AUTH_ATTEMPT_LIMIT)
 def forgot_password(
     request: Request,
     body: schemas.ForgotPasswordRequest,
@@ -493,7 +497,7 @@ def forgot_password(
 
 
 @router.post("/reset-password", response_model=schemas.MessageResponse)
-@limiter.limit("5/minute")
+@limiter.limit(AUTH_ATTEMPT_LIMIT)
 def reset_password(
     request: Request,
     body: schemas.ResetPasswordRequest,
@@ -532,7 +536,7 @@ def reset_password(
 # ============================================
 
 @router.post("/verify-email", response_model=schemas.MessageResponse)
-@limiter.limit("10/minute")
+@limiter.limit(AUTH_ATTEMPT_LIMIT)
 def verify_email(
     request: Request,
     body: schemas.VerifyEmailRequest,
@@ -10,6 +10,12 @@ from datetime import datetime
 from .. import models, schemas
 from ..database import get_db
 
+# Optional: orjson, as used for API responses in main.py
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 router = APIRouter(
     prefix="/export",
     tags=["export"]
@@ -48,9 +54,12 @@ def export_transactions(
         ]
         
         # Create a generator-like stream for JSON
-        json_str = json.dumps(data, indent=2)
+        if orjson is not None:
+            json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            json_bytes = json.dumps(data, indent=2).encode()
         return StreamingResponse(
-            io.StringIO(json_str),
+            io.BytesIO(json_bytes),
             media_type="application/json",
             headers={"Content-Disposition": f"attachment; filename=transactions_export_{datetime.now().strftime('%Y%m%d')}.json"}
         )
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form, BackgroundTasks
+from sqlalchemy import insert
 from sqlalchemy.orm import Session, joinedload
 from typing import List
 
@@ -278,9 +279,8 @@ def process_transactions_preview(extracted_data, user, db, spender, skip_duplica
             ai_predictions = ai_categorizer.categorize_batch_sync(pending_transactions, bucket_names)
             
             # Apply AI predictions
-            for txn_data in pending_transactions:
+            for local_idx, txn_data in enumerate(pending_transactions):
                 idx = txn_data['index']
-                local_idx = pending_transactions.index(txn_data)
                 
                 if local_idx in ai_predictions:
                     predicted_bucket, ai_confidence = ai_predictions[local_idx]
@@ -305,6 +305,7 @@ def process_transactions_preview(extracted_data, user, db, spender, skip_duplica
         
         preview_txn = {
             'id': -(i + 1),  # Negative temp ID
+            'user_id': user.id,
             'date': data["date"].isoformat() if hasattr(data["date"], 'isoformat') else str(data["date"]),
             'description': result['clean_desc'],
             'raw_description': data["description"],
@@ -461,9 +462,8 @@ def process_transactions_preview_with_progress(
                 progress_callback=ai_progress
             )
             
-            for txn_data in pending_transactions:
+            for local_idx, txn_data in enumerate(pending_transactions):
                 idx = txn_data['index']
-                local_idx = pending_transactions.index(txn_data)
                 if local_idx in ai_predictions:
                     predicted_bucket, ai_confidence = ai_predictions[local_idx]
                     matched_bucket_id = bucket_map.get(predicted_bucket.lower())
@@ -550,7 +550,6 @@ async def ingest_csv(
     db: Session = Depends(get_db), 
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    content = await file.read()
     mapping = {
         "date": map_date, 
         "description": map_desc, 
@@ -560,7 +559,8 @@ async def ingest_csv(
     }
     
     try:
-        extracted_data = process_csv(content, mapping)
+        # Parse straight from the spooled upload instead of reading it all into memory
+        extracted_data = process_csv(file.file, mapping)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
         
@@ -755,6 +755,19 @@ def confirm_transactions(updates: List[schemas.TransactionConfirm], db: Session
     from datetime import datetime
     
     confirmed_ids = []
+    new_rows = []
+    
+    # Prefetch every existing transaction being confirmed in one query
+    existing_ids = [u.id for u in updates if u.id >= 0]
+    existing_txns = {}
+    if existing_ids:
+        existing_txns = {
+            t.id: t
+            for t in db.query(models.Transaction).filter(
+                models.Transaction.id.in_(existing_ids),
+                models.Transaction.user_id == current_user.id
+            ).all()
+        }
     
     for update in updates:
         if update.id < 0:
@@ -769,31 +782,25 @@ def confirm_transactions(updates: List[schemas.TransactionConfirm], db: Session
             except:
                 txn_date = datetime.strptime(update.date, "%Y-%m-%d")
             
-            db_txn = models.Transaction(
-                date=txn_date,
-                description=update.description,
-                raw_description=update.raw_description or update.description,
-                amount=update.amount,
-                user_id=current_user.id,
-                bucket_id=update.bucket_id,
-                is_verified=True,  # User confirmed = verified
-                spender=update.spender or "Joint",
-                goal_id=update.goal_id,
-                tags=update.tags,
-                assigned_to=update.assigned_to
-            )
-            db.add(db_txn)
-            db.flush()  # Get the ID without committing
-            confirmed_ids.append(db_txn.id)
+            new_rows.append({
+                "date": txn_date,
+                "description": update.description,
+                "raw_description": update.raw_description or update.description,
+                "amount": update.amount,
+                "user_id": current_user.id,
+                "bucket_id": update.bucket_id,
+                "is_verified": True,  # User confirmed = verified
+                "spender": update.spender or "Joint",
+                "goal_id": update.goal_id,
+                "tags": update.tags,
+                "assigned_to": update.assigned_to
+            })
             
             # Note: Auto-rule creation has been removed.
             # Rules are now created explicitly via Smart Rules page or CreateRuleModal.
         else:
             # EXISTING TRANSACTION - Update
-            txn = db.query(models.Transaction).filter(
-                models.Transaction.id == update.id, 
-                models.Transaction.user_id == current_user.id
-            ).first()
+            txn = existing_txns.get(update.id)
             
             if txn:
                 txn.bucket_id = update.bucket_id
@@ -809,6 +816,13 @@ def confirm_transactions(updates: List[schemas.TransactionConfirm], db: Session
                 # Note: No auto-learning for existing transaction updates
                 # These are often corrections, not patterns to learn from
     
+    # Insert all new transactions with one bulk INSERT ... RETURNING instead of a flush per row
+    if new_rows:
+        confirmed_ids.extend(db.scalars(
+            insert(models.Transaction).returning(models.Transaction.id, sort_by_parameter_order=True),
+            new_rows
+        ).all())
+    
     db.commit()
     
     # Check budget exceeded for affected buckets
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
@@ -36,6 +37,22 @@ def create_account(account: schemas.AccountCreate, db: Session = Depends(get_db)
     db.refresh(db_account)
     return db_account
 
+@router.post("/accounts/batch", response_model=List[schemas.Account])
+def create_accounts_batch(accounts: List[schemas.AccountCreate], db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    """Create multiple accounts with a single bulk INSERT ... RETURNING."""
+    if not accounts:
+        return []
+    rows = [{**account.dict(), "user_id": current_user.id} for account in accounts]
+    # SQLAlchemy batches RETURNING where the driver supports it and falls back to per-row otherwise
+    db_accounts = db.scalars(
+        insert(models.Account).returning(models.Account, sort_by_parameter_order=True),
+        rows
+    ).all()
+    # Serialize from the RETURNING rows before commit expires them (which would cost a SELECT each)
+    created = [schemas.Account.model_validate(account) for account in db_accounts]
+    db.commit()
+    return created
+
 @router.put("/accounts/{account_id}", response_model=schemas.Account)
 def update_account(account_id: int, account_update: schemas.AccountCreate, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
     db_account = db.query(models.Account).filter(models.Account.id == account_id, models.Account.user_id == current_user.id).first()
@@ -153,8 +170,16 @@ def create_snapshot(snapshot_in: schemas.NetWorthSnapshotCreate, db: Session = D
     db.refresh(new_snapshot)
     
     # Add Balances
+    # One lookup for every referenced account instead of one query per balance
+    account_ids = {b.account_id for b in snapshot_in.balances}
+    accounts = {
+        a.id: a
+        for a in db.query(models.Account).filter(models.Account.id.in_(account_ids), models.Account.user_id == current_user.id).all()
+    }
+    
+    balance_rows = []
     for balance_item in snapshot_in.balances:
-        account = db.query(models.Account).filter(models.Account.id == balance_item.account_id, models.Account.user_id == current_user.id).first()
+        account = accounts.get(balance_item.account_id)
         if not account: continue
         
         # Calculate Logic
@@ -166,12 +191,15 @@ def create_snapshot(snapshot_in: schemas.NetWorthSnapshotCreate, db: Session = D
             # Standard: Liabilities are positive numbers representing debt amount. 
             # Net Worth = Assets - Liabilities.
             
-        db_balance = models.AccountBalance(
-            snapshot_id=new_snapshot.id,
-            account_id=account.id,
-            balance=val
-        )
-        db.add(db_balance)
+        balance_rows.append({
+            "snapshot_id": new_snapshot.id,
+            "account_id": account.id,
+            "balance": val
+        })
+    
+    # Single executemany INSERT for all balances
+    if balance_rows:
+        db.execute(models.AccountBalance.__table__.insert(), balance_rows)
         
     new_snapshot.total_assets = total_assets
     new_snapshot.total_liabilities = total_liabilities
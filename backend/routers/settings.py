@@ -6,6 +6,7 @@ import os
 import shutil
 
 from .. import models, schemas, auth
+from ..cache import CacheManager, cache_get, cache_set, get_redis
 from ..database import get_db
 
 router = APIRouter(
@@ -32,12 +33,7 @@ def get_user_settings(db: Session = Depends(get_db), current_user: models.User =
 def update_user_settings(settings: schemas.UserSettingsUpdate, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
     user = current_user
     
-    if settings.is_couple_mode is not None:
-        user.is_couple_mode = settings.is_couple_mode
-    if settings.name_a is not None:
-        user.name_a = settings.name_a
-    if settings.name_b is not None:
-        user.name_b = settings.name_b
+    # Couple mode / partner names moved to household members; only currency is set here
     if settings.currency_symbol is not None:
         user.currency_symbol = settings.currency_symbol
         
@@ -76,6 +72,8 @@ async def restore_backup(file: UploadFile = File(...), current_user: models.User
             shutil.copy("./principal_v5.db.bak", db_path)
         raise HTTPException(status_code=500, detail=f"Restore failed: {str(e)}")
     
+    # Every user's buckets may have changed
+    CacheManager.invalidate_user_buckets()
     return {"message": "Database restored successfully"}
 
 # --- Household Members ---
@@ -93,7 +91,7 @@ def create_member(member: schemas.HouseholdMemberCreate, db: Session = Depends(g
         
     db_member = models.HouseholdMember(
         user_id=current_user.id,
-        name=html.unescape(member.name),
+        name=schemas.unescape_text(member.name),
         color=member.color,
         avatar=member.avatar
     )
@@ -112,7 +110,7 @@ def update_member(member_id: int, member: schemas.HouseholdMemberCreate, db: Ses
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
         
-    db_member.name = html.unescape(member.name)
+    db_member.name = schemas.unescape_text(member.name)
     db_member.color = member.color
     db_member.avatar = member.avatar
     
@@ -144,6 +142,7 @@ def delete_member(member_id: int, db: Session = Depends(get_db), current_user: m
     
     db.delete(db_member)
     db.commit()
+    CacheManager.invalidate_user_buckets(current_user.id)
     return {"ok": True}
 
 # --- Budget Buckets ---
@@ -154,6 +153,12 @@ def get_buckets(db: Session = Depends(get_db), current_user: models.User = Depen
     if not user:
         return []
     
+    # The bucket list is read on most pages and rarely changes; serve it from Redis when configured
+    cache_key = CacheManager.user_buckets_key(user.id)
+    cached_buckets = cache_get(cache_key)
+    if cached_buckets is not None:
+        return cached_buckets
+    
     # Pre-populate defaults if empty
     existing_buckets = db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()
     if not existing_buckets:
@@ -180,11 +185,19 @@ def get_buckets(db: Session = Depends(get_db), current_user: models.User = Depen
         db.commit()
     
     # Use joinedload to eagerly load tags
-    return db.query(models.BudgetBucket)\
+    buckets = db.query(models.BudgetBucket)\
              .options(joinedload(models.BudgetBucket.tags), joinedload(models.BudgetBucket.limits))\
              .filter(models.BudgetBucket.user_id == user.id)\
              .order_by(models.BudgetBucket.display_order)\
              .all()
+    
+    if get_redis() is not None:
+        cache_set(
+            cache_key,
+            [schemas.BudgetBucket.model_validate(b).model_dump(mode="json") for b in buckets],
+            ttl=CacheManager.TTL_SHORT
+        )
+    return buckets
 
 
 @router.get("/buckets/tree")
@@ -284,6 +297,7 @@ def reorder_buckets(
             bucket.display_order = new_order
     
     db.commit()
+    CacheManager.invalidate_user_buckets(current_user.id)
     return {"ok": True}
 
 
@@ -343,12 +357,10 @@ def process_limits(db: Session, bucket: models.BudgetBucket, limits_data: List[s
                 amount=l.amount
             ))
 
-import html
-
 @router.post("/buckets", response_model=schemas.BudgetBucket)
 def create_bucket(bucket: schemas.BudgetBucketCreate, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
     # Unescape name to prevent double encoding
-    clean_name = html.unescape(bucket.name) if bucket.name else bucket.name
+    clean_name = schemas.unescape_text(bucket.name)
     
     db_bucket = models.BudgetBucket(
         name=clean_name,
@@ -375,6 +387,7 @@ def create_bucket(bucket: schemas.BudgetBucketCreate, db: Session = Depends(get_
             
         db.commit()
         db.refresh(db_bucket)
+        CacheManager.invalidate_user_buckets(current_user.id)
         return db_bucket
     except Exception as e:
         import traceback
@@ -389,7 +402,7 @@ def update_bucket(bucket_id: int, bucket: schemas.BudgetBucketCreate, db: Sessio
         raise HTTPException(status_code=404, detail="Bucket not found")
     
     # Unescape name 
-    clean_name = html.unescape(bucket.name) if bucket.name else bucket.name
+    clean_name = schemas.unescape_text(bucket.name)
     
     db_bucket.name = clean_name
     db_bucket.icon_name = bucket.icon_name
@@ -417,6 +430,7 @@ def update_bucket(bucket_id: int, bucket: schemas.BudgetBucketCreate, db: Sessio
     
     db.commit()
     db.refresh(db_bucket)
+    CacheManager.invalidate_user_buckets(current_user.id)
     return db_bucket
 
 @router.delete("/buckets/{bucket_id}")
@@ -438,6 +452,7 @@ def delete_bucket(bucket_id: int, db: Session = Depends(get_db), current_user: m
     
     db.delete(db_bucket)
     db.commit()
+    CacheManager.invalidate_user_buckets(current_user.id)
     return {"ok": True}
 
 # --- Notification Settings ---
@@ -18,6 +18,23 @@ def sanitize_text(value: Optional[str], max_length: int = 1000) -> Optional[str]
     return html.escape(value, quote=True)
 
 
+def unescape_text(value: Optional[str]) -> Optional[str]:
+    """
+    Reverse sanitize_text's escaping before storing a display name.
+    Only the five entities html.escape emits can occur, so targeted replaces
+    ('&amp;' last, so nothing is decoded twice) invert it exactly.
+    """
+    if not value or "&" not in value:
+        return value
+    return (
+        value.replace("&lt;", "<")
+        .replace("&gt;", ">")
+        .replace("&quot;", '"')
+        .replace("&#x27;", "'")
+        .replace("&amp;", "&")
+    )
+
+
 # Tags
 class TagBase(BaseModel):
     name: str
@@ -28,7 +45,9 @@ class TagBase(BaseModel):
         return sanitize_text(v, max_length=100) or ""
 
 class TagCreate(TagBase):
-    pass
+    # Schemas no route references use defer_build: the validator is built on first use
+    class Config:
+        defer_build = True
 
 class Tag(TagBase):
     id: int
@@ -41,7 +60,8 @@ class BudgetLimitBase(BaseModel):
     amount: float
 
 class BudgetLimitCreate(BudgetLimitBase):
-    pass
+    class Config:
+        defer_build = True
 
 class BudgetLimit(BudgetLimitBase):
     id: int
@@ -251,6 +271,9 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+    class Config:
+        defer_build = True
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -259,6 +282,9 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+    class Config:
+        defer_build = True
+
 class User(UserBase):
     id: str
     name: Optional[str] = None
@@ -502,7 +528,8 @@ class NotificationBase(BaseModel):
     meta_data: Optional[str] = None
 
 class NotificationCreate(NotificationBase):
-    pass
+    class Config:
+        defer_build = True
 
 class Notification(NotificationBase):
     id: int
@@ -557,6 +584,9 @@ class SavingsOpportunity(BaseModel):
     action: str
     severity: str = "medium"  # low, medium, high
 
+    class Config:
+        defer_build = True
+
 
 # ============================================
 # HOUSEHOLD / FAMILY SHARING SCHEMAS
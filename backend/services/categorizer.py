@@ -1,43 +1,67 @@
 import re
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 
+from .. import models
+from .keyword_matcher import KeywordMatcher
+
+@lru_cache(maxsize=256)
+def compile_rule_keywords(rule_keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Builds the keyword automaton for an ordered tuple of rule keyword strings,
+    mapping each keyword to its rule's index.
+    Cached by content, so a user's rules compile once and are reused across requests
+    until a rule is created, edited, reordered or deleted (which changes the tuple).
+    """
+    return KeywordMatcher(
+        (k.strip(), index)
+        for index, keywords in enumerate(rule_keywords)
+        for k in keywords.lower().split(",")
+    )
+
 class Categorizer:
     def __init__(self):
-        pass
+        # (rules list, matcher) for the last rule set seen; swapped as one tuple so
+        # concurrent requests sharing this instance never pair a matcher with the wrong list
+        self._rules_matcher = None
 
-    def apply_rules(self, description: str, rules, amount: float = None) -> Optional[int]:
+    def _matcher_for(self, rules) -> KeywordMatcher:
+        """
+        Returns the keyword automaton for rules.
+        Callers pass the same list for every transaction in a batch, so the lookup runs once per batch.
+        """
+        cached = self._rules_matcher
+        if cached is None or cached[0] is not rules:
+            cached = (rules, compile_rule_keywords(tuple(rule.keywords for rule in rules)))
+            self._rules_matcher = cached
+        return cached[1]
+
+    def apply_rules(self, description: str, rules, amount: Optional[float] = None) -> Optional[models.CategorizationRule]:
         """
         Applies priority-based regex rules.
         rules: List of CategorizationRule objects (ordered by priority desc)
         amount: Optional transaction amount to check against min_amount/max_amount conditions
-        Returns: bucket_id (int) or None
+        Returns: the first matching CategorizationRule, or None
         """
         description_lower = description.lower()
         
-        for rule in rules:
+        # One automaton pass finds every rule with a keyword in the description
+        # (simple substring semantics, as users expect "Woolworths" to match "Woolworths Metro").
+        # Walk the hits in rule order so priority is preserved.
+        hits = self._matcher_for(rules).find(description_lower)
+        if not hits:
+            return None
+        if amount is None:
+            # No amount to filter on: the highest-priority hit wins outright
+            return rules[min(hits)]
+        for index in sorted(hits):
+            rule = rules[index]
             # Check amount conditions if rule has them set
-            if amount is not None:
-                if rule.min_amount is not None and abs(amount) < rule.min_amount:
-                    continue  # Amount too low, skip this rule
-                if rule.max_amount is not None and abs(amount) > rule.max_amount:
-                    continue  # Amount too high, skip this rule
-            
-            keywords = rule.keywords.lower().split(",")
-            for k in keywords:
-                k = k.strip()
-                if not k: continue
-                # Exact match or word boundary match?
-                # User might input "Woolworths" and expects "Woolworths Metro" to match.
-                # Simple substring check is often expected, but risky ("car" matches "care").
-                # Let's use word boundary if possible, or substring if length > 3?
-                # For now, substring check is easiest for users to understand, but regex is more powerful.
-                # Hybrid: if k contains regex chars, use regex. Else substring.
-                
-                try:
-                    if k in description_lower:
-                        return rule
-                except:
-                    continue
+            if rule.min_amount is not None and abs(amount) < rule.min_amount:
+                continue  # Amount too low, skip this rule
+            if rule.max_amount is not None and abs(amount) > rule.max_amount:
+                continue  # Amount too high, skip this rule
+            return rule
                     
         return None
 
@@ -51,8 +75,9 @@ class Categorizer:
         description_lower = description.lower()
         
         for keyword, category in rules_map.items():
-            # word boundary regex to avoid partial matches like "parent" matching "rent"
-            if re.search(r'\b' + re.escape(keyword), description_lower) or keyword in description_lower:
+            # Plain substring match; the old word-boundary regex was OR'ed with this
+            # same test, so it never changed the result and only cost a compile per keyword
+            if keyword in description_lower:
                 return category, 1.0
                 
         return None, 0.0
@@ -71,6 +96,24 @@ class Categorizer:
         "transfers": ["transfer", "internal transfer", "credit card payment", "payment to", "payment from", "to acc", "from acc"]
     }
 
+    # Known aliases for each category, used when the user has no bucket named after it
+    CATEGORY_ALIASES = {
+        "groceries": ["food", "supermarket", "household"],
+        "eating out": ["dining", "takeaway", "restaurants", "food", "entertainment"], # Food is ambiguous
+        "transport": ["fuel", "car", "gas", "commute", "travel"],
+        "utilities": ["bills", "services", "phone", "internet"],
+        "health": ["medical", "wellness"],
+        "shopping": ["personal", "hobbies"],
+        "transfers": ["transfer", "credit card", "payments"],
+    }
+
+    # Flattened (keyword, category) pairs, built once, in GLOBAL_KEYWORDS order
+    KEYWORD_INDEX = tuple(
+        (keyword, category)
+        for category, keywords in GLOBAL_KEYWORDS.items()
+        for keyword in keywords
+    )
+
     def guess_category(self, description: str, bucket_map: Dict[str, int]) -> Tuple[Optional[int], float]:
         """
         Attempts to guess the bucket based on common global keywords.
@@ -79,43 +122,47 @@ class Categorizer:
         """
         desc_lower = description.lower()
         
-        for category, keywords in self.GLOBAL_KEYWORDS.items():
-            # Check if any keyword matches the description
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    # Match found! Now check if user has a relevant bucket.
-                    
-                    # 1. Direct Name Match (e.g. user has "Groceries" bucket)
-                    if category in bucket_map:
-                        return bucket_map[category], 0.7 # High confidence guess
-                        
-                    # 2. Semantic/Fuzzy Match?
-                    # If we found "Woolworths" -> "Groceries", but user has "Food" bucket?
-                    # Mapping known aliases:
-                    aliases = {
-                        "groceries": ["food", "supermarket", "household"],
-                        "eating out": ["dining", "takeaway", "restaurants", "food", "entertainment"], # Food is ambiguous
-                        "transport": ["fuel", "car", "gas", "commute", "travel"],
-                        "utilities": ["bills", "services", "phone", "internet"],
-                        "health": ["medical", "wellness"],
-                        "shopping": ["personal", "hobbies"],
-                        "transfers": ["transfer", "credit card", "payments"],
-                    }
+        for keyword, category in self.KEYWORD_INDEX:
+            # Check if the keyword matches the description
+            if keyword in desc_lower:
+                # Match found! Now check if user has a relevant bucket.
+                
+                # 1. Direct Name Match (e.g. user has "Groceries" bucket)
+                if category in bucket_map:
+                    return bucket_map[category], 0.7 # High confidence guess
                     
-                    if category in aliases:
-                        for alias in aliases[category]:
-                            if alias in bucket_map:
-                                return bucket_map[alias], 0.6 # Moderate confidence
-                                
-                    # 3. Fallback: Search all user buckets for the keyword 
-                    # (e.g. desc has "Uber", user has "Uber" bucket)
-                    # This might overlap with legacy predict but is broader
-                    for b_name, b_id in bucket_map.items():
-                        if keyword == b_name or b_name in keyword:
-                             return b_id, 0.8
-                             
+                # 2. Semantic/Fuzzy Match?
+                # If we found "Woolworths" -> "Groceries", but user has "Food" bucket?
+                for alias in self.CATEGORY_ALIASES.get(category, ()):
+                    if alias in bucket_map:
+                        return bucket_map[alias], 0.6 # Moderate confidence
+                            
+                # 3. Fallback: Search all user buckets for the keyword 
+                # (e.g. desc has "Uber", user has "Uber" bucket)
+                # This might overlap with legacy predict but is broader
+                for b_name, b_id in bucket_map.items():
+                    if keyword == b_name or b_name in keyword:
+                         return b_id, 0.8
+                         
         return None, 0.0
 
+    # Description cleanup patterns, compiled once instead of on every transaction
+    # 1. Common prefixes/suffixes, removed in this order
+    REMOVE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r"CARD PURCHASE",
+        r"POS PURCHASE",
+        r"VISA PURCHASE",
+        r"DEBIT PURCHASE",
+        r"EFTPOS",
+        r"Osko Payment",
+        r"Direct Debit",
+        r"Value Date:?",
+        r"\d{2} [A-Z]{3}", # Date like 15 NOV
+    ))
+    # 2. Purely numeric sequences or long ID strings
+    LONG_NUMBER_PATTERN = re.compile(r"\b\d{6,}\b")
+    WHITESPACE_PATTERN = re.compile(r"\s+")
+
     def clean_description(self, description: str) -> str:
         """
         Cleans up raw transaction descriptions to be more readable.
@@ -124,26 +171,14 @@ class Categorizer:
         text = description.upper()
         
         # 1. Remove common prefixes/suffixes
-        remove_patterns = [
-            r"CARD PURCHASE",
-            r"POS PURCHASE",
-            r"VISA PURCHASE",
-            r"DEBIT PURCHASE",
-            r"EFTPOS",
-            r"Osko Payment",
-            r"Direct Debit",
-            r"Value Date:?",
-            r"\d{2} [A-Z]{3}", # Date like 15 NOV
-        ]
-        
-        for pattern in remove_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+        for pattern in self.REMOVE_PATTERNS:
+            text = pattern.sub("", text)
             
         # 2. Remove purely numeric sequences or long ID strings
-        text = re.sub(r"\b\d{6,}\b", "", text) # Long numbers
+        text = self.LONG_NUMBER_PATTERN.sub("", text) # Long numbers
         
         # 3. Clean up whitespace
-        text = re.sub(r"\s+", " ", text).strip()
+        text = self.WHITESPACE_PATTERN.sub(" ", text).strip()
         
         # 4. Title case for better readability if it was all caps
         if text.isupper():
@@ -1,6 +1,8 @@
 import pandas as pd
 import io
-from typing import List, Dict, Any
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, BinaryIO, Iterator, Optional, Union
 from dateutil import parser as date_parser
 
 def parse_preview(file_bytes: bytes) -> Dict[str, Any]:
@@ -24,18 +26,67 @@ def parse_preview(file_bytes: bytes) -> Dict[str, Any]:
         "rows": df.to_dict(orient="records")
     }
 
-def process_csv(file_bytes: bytes, mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+# Rows parsed per pandas chunk; bounds parser memory on large statements
+CSV_CHUNK_ROWS = 10_000
+
+def _open_csv(source: Union[bytes, BinaryIO]) -> BinaryIO:
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+def _iter_csv_chunks(source: Union[bytes, BinaryIO]) -> Iterator[pd.DataFrame]:
     """
-    Reads entire CSV and maps columns to Transaction format.
-    mapping: { "date": "ColName", "description": "ColName", "amount": "ColName" }
+    Yields the CSV as DataFrames of at most CSV_CHUNK_ROWS rows.
+    Falls back to the python engine if the C parser fails, skipping chunks already yielded.
     """
+    yielded = 0
     try:
-        df = pd.read_csv(io.BytesIO(file_bytes), skipinitialspace=True)
+        for chunk in pd.read_csv(_open_csv(source), skipinitialspace=True, chunksize=CSV_CHUNK_ROWS):
+            yield chunk
+            yielded += 1
     except Exception:
-        df = pd.read_csv(io.BytesIO(file_bytes), engine='python', skipinitialspace=True)
-        
-    df = df.fillna("")
-    
+        reader = pd.read_csv(_open_csv(source), engine='python', skipinitialspace=True, chunksize=CSV_CHUNK_ROWS)
+        for i, chunk in enumerate(reader):
+            if i >= yielded:
+                yield chunk
+
+def _to_float(s: str) -> float:
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+def _clean_num_column(col: pd.Series) -> pd.Series:
+    """Parses a column of currency strings; blanks and unparseable values become 0.0"""
+    cleaned = col.astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False).str.strip()
+    nums = pd.to_numeric(cleaned, errors="coerce")
+    # Hand the few strings pandas rejects (e.g. "1_000") to float() so results match it exactly
+    rejected = nums.isna() & (cleaned != "")
+    if rejected.any():
+        nums[rejected] = cleaned[rejected].map(_to_float)
+    return nums.fillna(0.0).astype(float)
+
+@lru_cache(maxsize=4096)
+def _parse_date(raw_date: str) -> Optional[datetime]:
+    """
+    Parses a statement date (day first); None if it can't be read.
+    Statements repeat dates heavily, within and across chunks and uploads,
+    so each distinct string is parsed once.
+    """
+    try:
+        return date_parser.parse(raw_date, dayfirst=True)
+    except Exception as e:
+        # Skip malformed rows? Or Log?
+        print(f"Skipping rows due to error: {e}")
+        return None
+
+def process_csv(source: Union[bytes, BinaryIO], mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Reads the CSV chunk by chunk and maps columns to Transaction format.
+    source: raw bytes, or a seekable binary file (e.g. an UploadFile's spooled file)
+    mapping: { "date": "ColName", "description": "ColName", "amount": "ColName" }
+    """
     transactions = []
     
     col_date = mapping.get("date")
@@ -52,53 +103,43 @@ def process_csv(file_bytes: bytes, mapping: Dict[str, str]) -> List[Dict[str, An
     if not col_amount and not (col_debit or col_credit):
         raise ValueError("Either an Amount column OR Debit/Credit columns are required")
         
-    def clean_num(val):
-        """Helper to parse currency strings"""
-        if pd.isna(val) or val == "": return 0.0
-        s = str(val).replace("$", "").replace(",", "").strip()
-        if not s: return 0.0
-        try:
-            return float(s)
-        except:
-            return 0.0
-
-    for _, row in df.iterrows():
-        try:
-            # Parse Date
-            raw_date = str(row[col_date])
-            dt = date_parser.parse(raw_date, dayfirst=True)
-            
-            # Parse Amount
-            amount = 0.0
-            
-            if col_amount:
-                # Single Column Mode
-                amount = clean_num(row[col_amount])
-            else:
-                # Split Column Mode
-                # Logic: Credit is positive, Debit is negative.
-                # Usually statements have "Dr" or just positive numbers in Debit col.
-                # We assume values in columns are positive magnitudes usually.
-                
-                # Update: Use abs() because some CSVs put "-50.00" in Debit column, others "50.00".
-                # Both mean "Outflow", so we force it to be negative.
-                
-                credit_val = abs(clean_num(row.get(col_credit))) if col_credit else 0.0
-                debit_val = abs(clean_num(row.get(col_debit))) if col_debit else 0.0
-                
-                amount = credit_val - debit_val
-            
-            # Description
-            desc = str(row[col_desc])
-            
+    for df in _iter_csv_chunks(source):
+        df = df.fillna("")
+        
+        # Any mapped column missing from the file means no row can be read
+        required = [col_date, col_desc] + ([col_amount] if col_amount else [])
+        missing = [c for c in required if c not in df.columns]
+        if missing:
+            print(f"Skipping {len(df)} rows due to missing columns: {missing}")
+            continue
+        
+        # Parse Amount (whole column at once)
+        if col_amount:
+            # Single Column Mode
+            amounts = _clean_num_column(df[col_amount])
+        else:
+            # Split Column Mode
+            # Logic: Credit is positive, Debit is negative.
+            # Use abs() because some CSVs put "-50.00" in Debit column, others "50.00".
+            # Both mean "Outflow", so we force it to be negative.
+            zeros = pd.Series(0.0, index=df.index)
+            credit = _clean_num_column(df[col_credit]).abs() if col_credit in df.columns else zeros
+            debit = _clean_num_column(df[col_debit]).abs() if col_debit in df.columns else zeros
+            amounts = credit - debit
+        
+        # Parse Date
+        raw_dates = df[col_date].astype(str).tolist()
+        
+        descriptions = df[col_desc].astype(str).tolist()
+        
+        for raw_date, desc, amount in zip(raw_dates, descriptions, amounts.tolist()):
+            dt = _parse_date(raw_date)
+            if dt is None:
+                continue
             transactions.append({
                 "date": dt,
                 "description": desc,
                 "amount": amount
             })
-        except Exception as e:
-            # Skip malformed rows? Or Log?
-            print(f"Skipping row due to error: {e}")
-            continue
             
     return transactions
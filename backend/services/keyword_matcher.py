@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of keywords.
+    Scans a text once and reports every keyword occurring in it,
+    instead of one substring search per keyword.
+
+    keywords: Iterable of (keyword, value); value is returned on match
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        # Flat per-state tables: transitions, failure links, matched values
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for keyword, value in keywords:
+            if keyword:
+                self._add(keyword, value)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, value: int) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = nxt
+        self._out[state].add(value)
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first: depth-1 states fail to the root, deeper ones to the
+        # longest proper suffix that is also a keyword prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        """Returns the values of every keyword found anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
@@ -1,12 +1,15 @@
 import os
 import sys
 import asyncio
+import gzip
 import json
+import httpx
 from datetime import datetime, date
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, text, inspect, bindparam, Date, DateTime, MetaData
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
 
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -16,6 +19,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env.supabase'))
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 # Supabase Config
+# Writes use Prefer: return=minimal so PostgREST doesn't echo every row back
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
@@ -25,6 +29,21 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Direct PostgREST client for bulk upserts (lets us gzip large request bodies)
+rest_client = httpx.Client(
+    base_url=f"{SUPABASE_URL}/rest/v1",
+    headers={
+        "apikey": SUPABASE_KEY,
+        "Authorization": f"Bearer {SUPABASE_KEY}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=minimal",
+    },
+    timeout=60.0,
+)
+
+# Bodies smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 8 * 1024
+
 # Legacy DB Config
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -48,16 +67,43 @@ with open(mapping_path, 'r') as f:
 
 print(f"✅ Loaded {len(ID_MAPPING)} user mappings.")
 
-# Define migration order (parents first)
-TABLES = [
-    # Core
+
+# Columns never copied to Supabase (auth is handled by Supabase Auth)
+EXCLUDED_COLUMNS = {'hashed_password'}
+
+inspector = inspect(engine)
+
+def build_select(table_name):
+    """
+    Build a SELECT projecting only the columns we migrate.
+    Rows owned by users missing from ID_MAPPING are filtered in SQL so they
+    never cross the wire.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    columns = [
+        c['name'] for c in inspector.get_columns(table_name)
+        if c['name'] not in EXCLUDED_COLUMNS
+    ]
+    query = f"SELECT {', '.join(quote(c) for c in columns)} FROM {quote(table_name)}"
+
+    if table_name == 'users':
+        query += " WHERE id IN :ids"
+    elif 'user_id' in columns:
+        query += " WHERE user_id IS NULL OR user_id IN :ids"
+    else:
+        return text(query), {}
+
+    stmt = text(query).bindparams(bindparam('ids', expanding=True))
+    return stmt, {'ids': list(ID_MAPPING.keys())}
+
+# Tables to migrate. Order is derived from live FK metadata (parents first)
+MIGRATED_TABLES = {
     'users', # We need to populate public.users from legacy users info
     'households', # Has owner_id
     'household_members', 
-    'accounts', # Accounts before Goals
+    'accounts',
     'goals',
     'budget_buckets', # Needs 2-pass
-    # Children
     'transactions',
     'subscriptions',
     'household_users',
@@ -65,7 +111,6 @@ TABLES = [
     'api_keys',
     'notification_settings',
     'notifications',
-    # Deep children
     'investment_holdings',
     'budget_limits',
     'categorization_rules',
@@ -74,7 +119,42 @@ TABLES = [
     'category_goals',
     'ignored_rule_patterns',
     'tax_settings'
-]
+}
+
+def sort_tables_by_dependencies():
+    """Reflect the legacy schema and return MIGRATED_TABLES in FK dependency order."""
+    existing = set(inspector.get_table_names())
+    missing = MIGRATED_TABLES - existing
+    if missing:
+        print(f"⚠️  Tables not found in legacy DB, skipping: {', '.join(sorted(missing))}")
+
+    metadata = MetaData()
+    metadata.reflect(bind=engine, only=sorted(MIGRATED_TABLES & existing))
+    return [t.name for t in metadata.sorted_tables]
+
+TABLES = sort_tables_by_dependencies()
+
+_date_columns_cache = {}
+
+def get_date_columns(table_name):
+    """Names of Date/DateTime columns for a table, inspected once per table."""
+    if table_name not in _date_columns_cache:
+        _date_columns_cache[table_name] = [
+            c['name'] for c in inspector.get_columns(table_name)
+            if isinstance(c['type'], (Date, DateTime))
+        ]
+    return _date_columns_cache[table_name]
+
+def upsert_batch(table_name, batch):
+    """Upsert a batch via PostgREST, gzip-compressing large payloads."""
+    body = json.dumps(batch, separators=(',', ':')).encode('utf-8')
+    headers = {}
+    if len(body) > GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+
+    response = rest_client.post(f"/{table_name}", content=body, headers=headers)
+    response.raise_for_status()
 
 # Helper to serialize dates for JSON
 def json_serial(obj):
@@ -88,7 +168,8 @@ async def migrate_table(table_name):
     # 1. Fetch from Legacy
     try:
         # Use simple text query to avoid importing all models
-        result = session.execute(text(f"SELECT * FROM {table_name}"))
+        stmt, params = build_select(table_name)
+        result = session.execute(stmt, params)
         rows = result.fetchall()
         columns = result.keys()
     except Exception as e:
@@ -96,8 +177,8 @@ async def migrate_table(table_name):
         return
 
     records = []
-    skipped = 0
     parent_updates = [] # For buckets 2nd pass
+    date_cols = get_date_columns(table_name)
     
     for row in rows:
         # Convert row to dict
@@ -105,14 +186,9 @@ async def migrate_table(table_name):
         
         # TRANSFORMATION ------------------------
         
-        # 1. Map user_id
+        # 1. Map user_id (unmapped owners already filtered in SQL)
         if 'user_id' in data and data['user_id'] is not None:
-            legacy_uid = data['user_id']
-            if legacy_uid in ID_MAPPING:
-                data['user_id'] = ID_MAPPING[legacy_uid]
-            else:
-                skipped += 1
-                continue
+            data['user_id'] = ID_MAPPING[data['user_id']]
                 
         # 2. Map owner_id (Households)
         if 'owner_id' in data and data['owner_id'] is not None:
@@ -129,12 +205,7 @@ async def migrate_table(table_name):
         # 4. Handle 'users' table specifically for public.users
         if table_name == 'users':
             legacy_id = data.pop('id') # Remove integer ID
-            if legacy_id in ID_MAPPING:
-                data['id'] = ID_MAPPING[legacy_id]
-            else:
-                continue
-            if 'hashed_password' in data: 
-                del data['hashed_password']
+            data['id'] = ID_MAPPING[legacy_id]
 
         # 5. Handle Buckets (Self-Referential)
         if table_name == 'budget_buckets':
@@ -144,7 +215,8 @@ async def migrate_table(table_name):
                 data['parent_id'] = None # Remove for first pass
             
         # 6. Clean Data Types
-        for k, v in data.items():
+        for k in date_cols:
+            v = data.get(k)
             if isinstance(v, (datetime, date)):
                 data[k] = v.isoformat()
         
@@ -161,7 +233,7 @@ async def migrate_table(table_name):
     for i in range(0, len(records), batch_size):
         batch = records[i:i+batch_size]
         try:
-            response = supabase.table(table_name).upsert(batch).execute()
+            upsert_batch(table_name, batch)
         except Exception as e:
             print(f"   ❌ Error inserting batch: {str(e)}")
             # If buckets failed, we shouldn't try update
@@ -178,7 +250,7 @@ async def migrate_table(table_name):
             for item in batch:
                 try:
                     # Must use update() with ID match
-                    supabase.schema('public').table(table_name).update({'parent_id': item['parent_id']}).eq('id', item['id']).execute()
+                    supabase.schema('public').table(table_name).update({'parent_id': item['parent_id']}, returning=ReturnMethod.minimal).eq('id', item['id']).execute()
                 except Exception as e:
                      print(f"   ❌ Error updating parent for Bucket {item['id']}: {str(e)}")
 
@@ -190,20 +262,20 @@ async def migrate_transactions(rows, columns):
     
     parents = []
     splits = []
+    date_cols = get_date_columns('transactions')
     
     for row in rows:
         data = dict(zip(columns, row))
         
         # --- Common Transformation ---
-        # 1. Map user_id
-        if 'user_id' in data and data['user_id'] in ID_MAPPING:
-            data['user_id'] = ID_MAPPING[data['user_id']]
-        else:
-            # Skip if user not found
+        # 1. Map user_id (unmapped owners already filtered in SQL)
+        if data.get('user_id') is None:
             continue
+        data['user_id'] = ID_MAPPING[data['user_id']]
             
         # Clean Dates
-        for k, v in data.items():
+        for k in date_cols:
+            v = data.get(k)
             if isinstance(v, (datetime, date)):
                 data[k] = v.isoformat()
         
@@ -220,7 +292,7 @@ async def migrate_transactions(rows, columns):
     for i in range(0, len(parents), batch_size):
         batch = parents[i:i+batch_size]
         try:
-            supabase.schema('public').table('transactions').upsert(batch).execute()
+            upsert_batch('transactions', batch)
         except Exception as e:
              print(f"   ❌ Error inserting transactions batch: {str(e)}")
 
@@ -228,7 +300,7 @@ async def migrate_transactions(rows, columns):
     for i in range(0, len(splits), batch_size):
         batch = splits[i:i+batch_size]
         try:
-            supabase.schema('public').table('transactions').upsert(batch).execute()
+            upsert_batch('transactions', batch)
         except Exception as e:
              print(f"   ❌ Error inserting splits batch: {str(e)}")
 
@@ -253,7 +325,8 @@ async def main():
         if table == 'transactions':
             print(f"\n🔄 Migrating table: {table}")
             try:
-                result = session.execute(text(f"SELECT * FROM {table}"))
+                stmt, params = build_select(table)
+                result = session.execute(stmt, params)
                 columns = result.keys() # Get columns
                 rows = result.fetchall()
                 if rows:
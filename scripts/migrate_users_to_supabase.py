@@ -2,6 +2,7 @@ import os
 import sys
 import httpx
 import asyncio
+import random
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -47,6 +48,105 @@ def get_legacy_db_session():
     Session = sessionmaker(bind=engine)
     return Session()
 
+MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 30
+
+async def create_user_with_retry(client, supabase_url, headers, payload):
+    """
+    POST to the GoTrue admin API, retrying 429/5xx responses with
+    exponential backoff and jitter. Honors Retry-After when present.
+    Returns the last response received.
+    """
+    for attempt in range(MAX_RETRIES):
+        response = await client.post(
+            f"{supabase_url}/auth/v1/admin/users",
+            headers=headers,
+            json=payload
+        )
+        if response.status_code < 500 and response.status_code != 429:
+            return response
+
+        if attempt == MAX_RETRIES - 1:
+            break
+
+        retry_after = response.headers.get("Retry-After")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) + random.random()
+        print(f"   ⏳ {response.status_code} from Supabase, retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+
+    return response
+
+# Concurrent GoTrue admin requests in flight
+MAX_CONCURRENCY = 8
+
+async def migrate_one_user(client, sem, supabase_url, headers, user):
+    """
+    Create (or look up) a single user in Supabase Auth.
+    Returns the new UUID, or None if the user could not be mapped.
+    """
+    async with sem:
+        print(f"Processing {user.email}...")
+        
+        # Check if user exists
+        # Technically we can just try to create and catch error, 
+        # but let's be cleaner if we can. 
+        # Actually, admin API 'create_user' doesn't error if exists? 
+        # Documentation says it returns error.
+        
+        payload = {
+            "email": user.email,
+            "email_confirm": True, # Auto-verify migrated users
+            "user_metadata": {
+                "name": user.name or "",
+                "currency_symbol": user.currency_symbol or "AUD"
+            }
+            # We cannot migrate password hash (bcrypt vs argon2)
+            # User will need to reset password
+        }
+        
+        try:
+            response = await create_user_with_retry(client, supabase_url, headers, payload)
+        except Exception as e:
+            print(f"❌ Error processing {user.email}: {str(e)}")
+            return None
+
+        if response.status_code == 200:
+            data = response.json()
+            new_uuid = data['id']
+            print(f"✅ Created: {user.email} (Old ID: {user.id} -> New ID: {new_uuid})")
+            return new_uuid
+
+        if (response.status_code == 422 and "email_exists" in response.text) or \
+           (response.status_code == 400 and "User already registered" in response.text):
+            print(f"⚠️  Already registered: {user.email}. Fetching ID...")
+            
+            # Fetch existing user to get ID
+            # We'll list users and filter (fine for small batch, ideally use search param if available)
+            try:
+                list_resp = await client.get(
+                    f"{supabase_url}/auth/v1/admin/users",
+                    headers=headers
+                )
+                if list_resp.status_code == 200:
+                    all_users = list_resp.json().get("users", [])
+                    found = next((u for u in all_users if u["email"] == user.email), None)
+                    if found:
+                        new_uuid = found['id']
+                        print(f"   Mapping found: {new_uuid}")
+                        return new_uuid
+                    print(f"   Could not find user in list despite error.")
+                else:
+                    print(f"   Failed to list users: {list_resp.text}")
+            except Exception as fetch_err:
+                print(f"   Error fetching existing user: {fetch_err}")
+            return None
+
+        print(f"❌ Failed to create {user.email}: {response.text}")
+        return None
+
 async def migrate_users():
     print("🚀 Starting User Migration to Supabase...")
     
@@ -63,74 +163,23 @@ async def migrate_users():
         users = session.execute(select(User)).scalars().all()
         print(f"found {len(users)} users to migrate.")
         
+        for user in users:
+            if not user.email:
+                print(f"⚠️  Skipping user ID {user.id}: No email")
+        to_migrate = [u for u in users if u.email]
+        
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
         async with httpx.AsyncClient() as client:
-            for user in users:
-                if not user.email:
-                    print(f"⚠️  Skipping user ID {user.id}: No email")
-                    continue
-                    
-                print(f"Processing {user.email}...")
-                
-                # Check if user exists
-                # Technically we can just try to create and catch error, 
-                # but let's be cleaner if we can. 
-                # Actually, admin API 'create_user' doesn't error if exists? 
-                # Documentation says it returns error.
-                
-                payload = {
-                    "email": user.email,
-                    "email_confirm": True, # Auto-verify migrated users
-                    "user_metadata": {
-                        "name": user.name or "",
-                        "currency_symbol": user.currency_symbol or "AUD"
-                    }
-                    # We cannot migrate password hash (bcrypt vs argon2)
-                    # User will need to reset password
-                }
-                
-                try:
-                    response = await client.post(
-                        f"{supabase_url}/auth/v1/admin/users",
-                        headers=headers,
-                        json=payload
-                    )
-                except Exception as e:
-                    print(f"❌ Error processing {user.email}: {str(e)}")
-                    continue
-
-                if response.status_code == 200:
-                    data = response.json()
-                    new_uuid = data['id']
-                    print(f"✅ Created: {user.email} (Old ID: {user.id} -> New ID: {new_uuid})")
-                    id_mapping[user.id] = new_uuid
-
-                elif (response.status_code == 422 and "email_exists" in response.text) or \
-                     (response.status_code == 400 and "User already registered" in response.text):
-                     print(f"⚠️  Already registered: {user.email}. Fetching ID...")
-                     
-                     # Fetch existing user to get ID
-                     # We'll list users and filter (fine for small batch, ideally use search param if available)
-                     try:
-                         list_resp = await client.get(
-                             f"{supabase_url}/auth/v1/admin/users",
-                             headers=headers
-                         )
-                         if list_resp.status_code == 200:
-                             all_users = list_resp.json().get("users", [])
-                             found = next((u for u in all_users if u["email"] == user.email), None)
-                             if found:
-                                 new_uuid = found['id']
-                                 print(f"   Mapping found: {new_uuid}")
-                                 id_mapping[user.id] = new_uuid
-                             else:
-                                 print(f"   Could not find user in list despite error.")
-                         else:
-                             print(f"   Failed to list users: {list_resp.text}")
-                     except Exception as fetch_err:
-                         print(f"   Error fetching existing user: {fetch_err}")
-
-                else:
-                    print(f"❌ Failed to create {user.email}: {response.text}")
+            results = await asyncio.gather(*(
+                migrate_one_user(client, sem, supabase_url, headers, user)
+                for user in to_migrate
+            ))
+        
+        id_mapping = {
+            user.id: new_uuid
+            for user, new_uuid in zip(to_migrate, results)
+            if new_uuid is not None
+        }
         
         # Save mapping to file
         import json
@@ -145,7 +194,4 @@ async def migrate_users():
         session.close()
 
 if __name__ == "__main__":
-    # Initialize empty mapping
-    global id_mapping
-    id_mapping = {}
     asyncio.run(migrate_users())
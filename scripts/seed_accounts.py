@@ -1,3 +1,5 @@
+from sqlalchemy import select
+
 from backend.database import SessionLocal, engine
 from backend.models import Account, Base
 
@@ -15,21 +17,21 @@ def seed_accounts():
     ]
     
     print("Seeding Accounts...")
-    count = 0
+    # One query for all existing names instead of a lookup per default
+    existing = {name for (name,) in db.execute(select(Account.name))}
+    new_accs = []
     for acc in defaults:
-        exists = db.query(Account).filter(Account.name == acc["name"]).first()
-        if not exists:
-            new_acc = Account(
+        if acc["name"] not in existing:
+            new_accs.append(Account(
                 name=acc["name"],
                 type=acc["type"],
                 category=acc["category"]
-            )
-            db.add(new_acc)
-            count += 1
+            ))
             print(f"Added: {acc['name']}")
     
+    db.add_all(new_accs)
     db.commit()
-    print(f"Done! Added {count} new accounts.")
+    print(f"Done! Added {len(new_accs)} new accounts.")
     db.close()
 
 if __name__ == "__main__":
@@ -1,77 +1,95 @@
-from sqlalchemy.orm import Session
+from __future__ import annotations
+
+from sqlalchemy.orm import Session, selectinload
 from backend.database import SessionLocal, engine
 from backend import models
 
 def seed_buckets():
     db: Session = SessionLocal()
     try:
-        user = db.query(models.User).filter(models.User.id == 1).first()
-        if not user:
-            print("User ID 1 not found. Creating...")
-            user = models.User(username="Owner", id=1)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+        # Single transaction: one COMMIT when the block exits, rollback on error
+        with db.begin():
+            user = db.get(models.User, 1)  # primary-key lookup, served from the identity map when cached
+            if not user:
+                print("User ID 1 not found. Creating...")
+                user = models.User(username="Owner", id=1)
+                db.add(user)
+                db.flush()
+                
+            # Default Buckets and Tags (Migrated from categorizer.py)
+            # Default Buckets and Tags (Migrated from categorizer.py)
+            defaults = [
+                {"name": "Rent/Mortgage", "icon": "Home", "limit": 1500, "group": "Non-Discretionary", "tags": ["rent", "mortgage", "strata"]},
+                {"name": "Groceries", "icon": "Utensils", "limit": 800, "group": "Non-Discretionary", "tags": ["woolworths", "coles", "aldi", "harris farm", "iga"]},
+                {"name": "Utilities", "icon": "Zap", "limit": 200, "group": "Non-Discretionary", "tags": ["electricity", "water", "gas", "internet", "telstra"]},
+                {"name": "Transport", "icon": "Car", "limit": 150, "group": "Non-Discretionary", "tags": ["uber", "opal", "fuel", "bp", "shell"]},
+                {"name": "Health", "icon": "Heart", "limit": 150, "group": "Non-Discretionary", "tags": ["chemist", "doctor", "dentist", "gym"]},
+                {"name": "Dining Out", "icon": "Coffee", "limit": 300, "group": "Discretionary", "tags": ["restaurant", "cafe", "bar", "mcdonalds", "kfc"]},
+                {"name": "Entertainment", "icon": "Film", "limit": 100, "group": "Discretionary", "tags": ["netflix", "spotify", "cinema", "ticketek"]},
+                {"name": "Shopping", "icon": "ShoppingBag", "limit": 400, "group": "Discretionary", "tags": ["amazon", "kmart", "target", "myer", "uniqlo"]},
+                {"name": "Travel", "icon": "Plane", "limit": 0, "group": "Discretionary", "tags": ["flight", "hotel", "airbnb", "booking.com"]}
+            ]
             
-        # Default Buckets and Tags (Migrated from categorizer.py)
-        # Default Buckets and Tags (Migrated from categorizer.py)
-        defaults = [
-            {"name": "Rent/Mortgage", "icon": "Home", "limit": 1500, "group": "Non-Discretionary", "tags": ["rent", "mortgage", "strata"]},
-            {"name": "Groceries", "icon": "Utensils", "limit": 800, "group": "Non-Discretionary", "tags": ["woolworths", "coles", "aldi", "harris farm", "iga"]},
-            {"name": "Utilities", "icon": "Zap", "limit": 200, "group": "Non-Discretionary", "tags": ["electricity", "water", "gas", "internet", "telstra"]},
-            {"name": "Transport", "icon": "Car", "limit": 150, "group": "Non-Discretionary", "tags": ["uber", "opal", "fuel", "bp", "shell"]},
-            {"name": "Health", "icon": "Heart", "limit": 150, "group": "Non-Discretionary", "tags": ["chemist", "doctor", "dentist", "gym"]},
-            {"name": "Dining Out", "icon": "Coffee", "limit": 300, "group": "Discretionary", "tags": ["restaurant", "cafe", "bar", "mcdonalds", "kfc"]},
-            {"name": "Entertainment", "icon": "Film", "limit": 100, "group": "Discretionary", "tags": ["netflix", "spotify", "cinema", "ticketek"]},
-            {"name": "Shopping", "icon": "ShoppingBag", "limit": 400, "group": "Discretionary", "tags": ["amazon", "kmart", "target", "myer", "uniqlo"]},
-            {"name": "Travel", "icon": "Plane", "limit": 0, "group": "Discretionary", "tags": ["flight", "hotel", "airbnb", "booking.com"]}
-        ]
-        
-        for b in defaults:
-            # 1. Ensure Bucket Exists
-            bucket = db.query(models.BudgetBucket).filter(
-                models.BudgetBucket.user_id == user.id,
-                models.BudgetBucket.name == b["name"]
-            ).first()
+            # Prefetch every tag and bucket we might touch: one query each instead of one per item
+            tag_names = {t for b in defaults for t in b["tags"]}
+            tag_map = {
+                t.name: t
+                for t in db.query(models.Tag).filter(models.Tag.name.in_(tag_names)).all()
+            }
+            # Create every missing tag up front; a single flush assigns all their IDs
+            new_tags = [models.Tag(name=name) for name in sorted(tag_names - tag_map.keys())]
+            if new_tags:
+                for tag in new_tags:
+                    print(f"  Creating Tag: {tag.name}")
+                db.add_all(new_tags)
+                db.flush()
+                tag_map.update({tag.name: tag for tag in new_tags})
+            bucket_map = {
+                bucket.name: bucket
+                for bucket in db.query(models.BudgetBucket)
+                    .options(selectinload(models.BudgetBucket.tags))
+                    .filter(
+                        models.BudgetBucket.user_id == user.id,
+                        models.BudgetBucket.name.in_([b["name"] for b in defaults])
+                    )
+                    .all()
+            }
             
-            if not bucket:
-                print(f"Creating bucket: {b['name']}")
-                bucket = models.BudgetBucket(
-                    user_id=user.id,
-                    name=b["name"],
-                    monthly_limit_a=b["limit"],
-                    icon_name=b["icon"],
-                    is_shared=True,
-                    monthly_limit_b=0,
-                    group=b.get("group", "Discretionary")
-                )
-                db.add(bucket)
-                db.commit() # Commit to get ID for relationships
-                db.refresh(bucket)
-            else:
-                print(f"Bucket {b['name']} exists. Updating group.")
-                bucket.group = b.get("group", "Discretionary")
-                bucket.icon_name = b.get("icon", "Wallet")
-                db.commit()
+            link_rows = []
+            for b in defaults:
+                # 1. Ensure Bucket Exists
+                bucket = bucket_map.get(b["name"])
                 
-            # 2. Process Tags
-            existing_tags = [t.name for t in bucket.tags]
-            for tag_name in b["tags"]:
-                if tag_name not in existing_tags:
-                    # Check if Tag object exists globally
-                    db_tag = db.query(models.Tag).filter(models.Tag.name == tag_name).first()
-                    if not db_tag:
-                         print(f"  Creating Tag: {tag_name}")
-                         db_tag = models.Tag(name=tag_name)
-                         db.add(db_tag)
-                         db.commit()
-                         db.refresh(db_tag)
+                if not bucket:
+                    print(f"Creating bucket: {b['name']}")
+                    bucket = models.BudgetBucket(
+                        user_id=user.id,
+                        name=b["name"],
+                        monthly_limit_a=b["limit"],
+                        icon_name=b["icon"],
+                        is_shared=True,
+                        monthly_limit_b=0,
+                        group=b.get("group", "Discretionary")
+                    )
+                    db.add(bucket)
+                    db.flush() # Flush to get ID for relationships; no refresh needed
+                    existing_tags = set()  # brand new bucket: skip the lazy tags SELECT
+                else:
+                    print(f"Bucket {b['name']} exists. Updating group.")
+                    bucket.group = b.get("group", "Discretionary")
+                    bucket.icon_name = b.get("icon", "Wallet")
+                    existing_tags = {t.name for t in bucket.tags}  # already selectin-loaded
                     
-                    if db_tag not in bucket.tags:
-                         print(f"  Linking Tag '{tag_name}' to Bucket '{b['name']}'")
-                         bucket.tags.append(db_tag)
+                # 2. Process Tags
+                for tag_name in b["tags"]:
+                    if tag_name not in existing_tags:
+                        db_tag = tag_map[tag_name]
+                        print(f"  Linking Tag '{tag_name}' to Bucket '{b['name']}'")
+                        link_rows.append({"bucket_id": bucket.id, "tag_id": db_tag.id})
             
-            db.commit()
+            # 3. Write every new bucket/tag link in a single executemany
+            if link_rows:
+                db.execute(models.bucket_tags.insert(), link_rows)
 
         print("Seeding complete.")
         
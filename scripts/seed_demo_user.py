@@ -12,95 +12,121 @@ This script creates a demo account with:
 
 Usage:
     python -m scripts.seed_demo_user
+    SEED_FAST=1 python -m scripts.seed_demo_user   # cheap password hash for local dev
 """
 
+from __future__ import annotations
+
 import random
 from datetime import datetime, timedelta
 from decimal import Decimal
+from dateutil.relativedelta import relativedelta
 import sys
 import os
+from typing import TYPE_CHECKING, NamedTuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.orm import Session
-from backend.database import SessionLocal, engine
-from backend import models
-from backend.auth import get_password_hash
+from sqlalchemy import create_engine, delete, event, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+# The backend (models, auth, engine) and NumPy are imported where they are
+# used, so importing this module doesn't pull in the whole app graph.
+if TYPE_CHECKING:
+    import numpy as np
+    from backend import models
 
 # Demo user credentials
 DEMO_EMAIL = "demo@principal.finance"
 DEMO_PASSWORD = "demo123"
 DEMO_NAME = "Demo User"
 
+# Fixed seed so reruns produce the same demo data
+DEMO_SEED = 42
+
 # Household members
 MEMBERS = [
     {"name": "Alex", "color": "#6366f1"},  # Indigo
     {"name": "Sam", "color": "#ec4899"},   # Pink
 ]
 
-# Hierarchical budget categories
-CATEGORIES = [
+# Hierarchical budget categories, stored flat: parents first, then children keyed by parent name.
+# A parent's limit only applies when it has no children.
+class ParentCategory(NamedTuple):
+    name: str
+    icon: str
+    group: str
+    is_shared: bool
+    is_transfer: bool
+    is_investment: bool
+    limit: float
+
+
+class ChildCategory(NamedTuple):
+    parent: str
+    name: str
+    icon: str
+    limit: float
+
+
+PARENT_CATEGORIES = [
     # Income
-    {"name": "Income", "icon": "Wallet", "group": "Income", "is_shared": True, "children": [
-        {"name": "Salary", "icon": "Briefcase", "limit": 0},
-        {"name": "Side Income", "icon": "DollarSign", "limit": 0},
-        {"name": "Investment Income", "icon": "TrendingUp", "limit": 0},
-    ]},
+    ParentCategory("Income", "Wallet", "Income", True, False, False, 0),
     # Non-Discretionary (Needs)
-    {"name": "Housing", "icon": "Home", "group": "Non-Discretionary", "is_shared": True, "children": [
-        {"name": "Rent/Mortgage", "icon": "Home", "limit": 2800},
-        {"name": "Strata/HOA", "icon": "Building", "limit": 400},
-        {"name": "Home Insurance", "icon": "Shield", "limit": 100},
-    ]},
-    {"name": "Utilities", "icon": "Zap", "group": "Non-Discretionary", "is_shared": True, "children": [
-        {"name": "Electricity", "icon": "Zap", "limit": 150},
-        {"name": "Gas", "icon": "Flame", "limit": 80},
-        {"name": "Water", "icon": "Droplet", "limit": 60},
-        {"name": "Internet", "icon": "Wifi", "limit": 90},
-        {"name": "Mobile Phone", "icon": "Smartphone", "limit": 120},
-    ]},
-    {"name": "Groceries", "icon": "ShoppingCart", "group": "Non-Discretionary", "is_shared": True, "limit": 1200},
-    {"name": "Transport", "icon": "Car", "group": "Non-Discretionary", "is_shared": False, "children": [
-        {"name": "Fuel", "icon": "Fuel", "limit": 200},
-        {"name": "Public Transport", "icon": "Train", "limit": 150},
-        {"name": "Car Insurance", "icon": "Shield", "limit": 120},
-        {"name": "Parking", "icon": "ParkingCircle", "limit": 80},
-    ]},
-    {"name": "Health", "icon": "Heart", "group": "Non-Discretionary", "is_shared": False, "children": [
-        {"name": "Health Insurance", "icon": "Shield", "limit": 280},
-        {"name": "Doctor/Medical", "icon": "Stethoscope", "limit": 100},
-        {"name": "Pharmacy", "icon": "Pill", "limit": 50},
-        {"name": "Gym", "icon": "Dumbbell", "limit": 100},
-    ]},
+    ParentCategory("Housing", "Home", "Non-Discretionary", True, False, False, 0),
+    ParentCategory("Utilities", "Zap", "Non-Discretionary", True, False, False, 0),
+    ParentCategory("Groceries", "ShoppingCart", "Non-Discretionary", True, False, False, 1200),
+    ParentCategory("Transport", "Car", "Non-Discretionary", False, False, False, 0),
+    ParentCategory("Health", "Heart", "Non-Discretionary", False, False, False, 0),
     # Discretionary (Wants)
-    {"name": "Food & Drink", "icon": "Utensils", "group": "Discretionary", "is_shared": False, "children": [
-        {"name": "Dining Out", "icon": "UtensilsCrossed", "limit": 400},
-        {"name": "Coffee & Cafes", "icon": "Coffee", "limit": 150},
-        {"name": "Takeaway", "icon": "Package", "limit": 200},
-        {"name": "Alcohol", "icon": "Wine", "limit": 100},
-    ]},
-    {"name": "Entertainment", "icon": "Film", "group": "Discretionary", "is_shared": True, "children": [
-        {"name": "Streaming", "icon": "Tv", "limit": 60},
-        {"name": "Gaming", "icon": "Gamepad2", "limit": 50},
-        {"name": "Movies & Events", "icon": "Ticket", "limit": 100},
-        {"name": "Hobbies", "icon": "Palette", "limit": 150},
-    ]},
-    {"name": "Shopping", "icon": "ShoppingBag", "group": "Discretionary", "is_shared": False, "children": [
-        {"name": "Clothing", "icon": "Shirt", "limit": 200},
-        {"name": "Electronics", "icon": "Laptop", "limit": 100},
-        {"name": "Home & Garden", "icon": "Sofa", "limit": 150},
-        {"name": "Gifts", "icon": "Gift", "limit": 100},
-    ]},
-    {"name": "Travel", "icon": "Plane", "group": "Discretionary", "is_shared": True, "limit": 500},
-    {"name": "Personal Care", "icon": "Sparkles", "group": "Discretionary", "is_shared": False, "limit": 150},
-    {"name": "Education", "icon": "GraduationCap", "group": "Discretionary", "is_shared": False, "limit": 100},
-    {"name": "Pets", "icon": "Cat", "group": "Discretionary", "is_shared": True, "limit": 200},
+    ParentCategory("Food & Drink", "Utensils", "Discretionary", False, False, False, 0),
+    ParentCategory("Entertainment", "Film", "Discretionary", True, False, False, 0),
+    ParentCategory("Shopping", "ShoppingBag", "Discretionary", False, False, False, 0),
+    ParentCategory("Travel", "Plane", "Discretionary", True, False, False, 500),
+    ParentCategory("Personal Care", "Sparkles", "Discretionary", False, False, False, 150),
+    ParentCategory("Education", "GraduationCap", "Discretionary", False, False, False, 100),
+    ParentCategory("Pets", "Cat", "Discretionary", True, False, False, 200),
     # Special Categories
-    {"name": "Reimbursable", "icon": "ReceiptText", "group": "Non-Discretionary", "is_shared": False, "limit": 0},
+    ParentCategory("Reimbursable", "ReceiptText", "Non-Discretionary", False, False, False, 0),
     # Transfers
-    {"name": "Transfers", "icon": "ArrowRightLeft", "group": "Transfers", "is_shared": True, "is_transfer": True},
-    {"name": "Investments", "icon": "TrendingUp", "group": "Transfers", "is_shared": True, "is_investment": True},
+    ParentCategory("Transfers", "ArrowRightLeft", "Transfers", True, True, False, 0),
+    ParentCategory("Investments", "TrendingUp", "Transfers", True, False, True, 0),
+]
+
+CHILD_CATEGORIES = [
+    ChildCategory("Income", "Salary", "Briefcase", 0),
+    ChildCategory("Income", "Side Income", "DollarSign", 0),
+    ChildCategory("Income", "Investment Income", "TrendingUp", 0),
+    ChildCategory("Housing", "Rent/Mortgage", "Home", 2800),
+    ChildCategory("Housing", "Strata/HOA", "Building", 400),
+    ChildCategory("Housing", "Home Insurance", "Shield", 100),
+    ChildCategory("Utilities", "Electricity", "Zap", 150),
+    ChildCategory("Utilities", "Gas", "Flame", 80),
+    ChildCategory("Utilities", "Water", "Droplet", 60),
+    ChildCategory("Utilities", "Internet", "Wifi", 90),
+    ChildCategory("Utilities", "Mobile Phone", "Smartphone", 120),
+    ChildCategory("Transport", "Fuel", "Fuel", 200),
+    ChildCategory("Transport", "Public Transport", "Train", 150),
+    ChildCategory("Transport", "Car Insurance", "Shield", 120),
+    ChildCategory("Transport", "Parking", "ParkingCircle", 80),
+    ChildCategory("Health", "Health Insurance", "Shield", 280),
+    ChildCategory("Health", "Doctor/Medical", "Stethoscope", 100),
+    ChildCategory("Health", "Pharmacy", "Pill", 50),
+    ChildCategory("Health", "Gym", "Dumbbell", 100),
+    ChildCategory("Food & Drink", "Dining Out", "UtensilsCrossed", 400),
+    ChildCategory("Food & Drink", "Coffee & Cafes", "Coffee", 150),
+    ChildCategory("Food & Drink", "Takeaway", "Package", 200),
+    ChildCategory("Food & Drink", "Alcohol", "Wine", 100),
+    ChildCategory("Entertainment", "Streaming", "Tv", 60),
+    ChildCategory("Entertainment", "Gaming", "Gamepad2", 50),
+    ChildCategory("Entertainment", "Movies & Events", "Ticket", 100),
+    ChildCategory("Entertainment", "Hobbies", "Palette", 150),
+    ChildCategory("Shopping", "Clothing", "Shirt", 200),
+    ChildCategory("Shopping", "Electronics", "Laptop", 100),
+    ChildCategory("Shopping", "Home & Garden", "Sofa", 150),
+    ChildCategory("Shopping", "Gifts", "Gift", 100),
 ]
 
 # Realistic merchants for transactions
@@ -145,6 +171,10 @@ MERCHANTS = {
     "Investments": [("COMMSEC PURCHASE", 500), ("STAKE DEPOSIT", 250)],
 }
 
+# Categories eligible for random transactions (salary is generated on a schedule)
+MERCHANT_CATEGORIES = tuple(c for c in MERCHANTS if c != "Salary")
+INCOME_CATEGORIES = frozenset({"Salary", "Side Income", "Investment Income"})
+
 # Accounts
 ACCOUNTS = [
     {"name": "Everyday Account", "type": "Asset", "category": "Cash", "balance": 5500},
@@ -207,49 +237,64 @@ RULES = [
 
 def clear_demo_user(db: Session):
     """Remove existing demo user and all related data."""
+    from backend import models
     user = db.query(models.User).filter(models.User.email == DEMO_EMAIL).first()
     if user:
         print(f"Removing existing demo user (ID: {user.id})...")
-        # Delete related data in correct order (respecting foreign keys)
-        db.query(models.Transaction).filter(models.Transaction.user_id == user.id).delete()
-        db.query(models.CategorizationRule).filter(models.CategorizationRule.user_id == user.id).delete()
-        db.query(models.Subscription).filter(models.Subscription.user_id == user.id).delete()
-        db.query(models.Goal).filter(models.Goal.user_id == user.id).delete()
-        # Delete budget limits before buckets
-        bucket_ids = [b.id for b in db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).all()]
-        if bucket_ids:
-            db.query(models.BudgetLimit).filter(models.BudgetLimit.bucket_id.in_(bucket_ids)).delete(synchronize_session=False)
-        db.query(models.BudgetBucket).filter(models.BudgetBucket.user_id == user.id).delete()
-        # Delete account-related data
-        account_ids = [a.id for a in db.query(models.Account).filter(models.Account.user_id == user.id).all()]
-        if account_ids:
-            db.query(models.InvestmentHolding).filter(models.InvestmentHolding.account_id.in_(account_ids)).delete(synchronize_session=False)
-        db.query(models.Account).filter(models.Account.user_id == user.id).delete()
-        db.query(models.HouseholdMember).filter(models.HouseholdMember.user_id == user.id).delete()
-        db.query(models.NetWorthSnapshot).filter(models.NetWorthSnapshot.user_id == user.id).delete()
-        db.delete(user)
-        db.commit()
+        bucket_ids = select(models.BudgetBucket.id).where(models.BudgetBucket.user_id == user.id)
+        account_ids = select(models.Account.id).where(models.Account.user_id == user.id)
+        
+        # Delete related data in correct order (respecting foreign keys).
+        # Plain Core DELETEs: nothing is loaded into the session just to be expired.
+        statements = [
+            delete(models.Transaction).where(models.Transaction.user_id == user.id),
+            delete(models.CategorizationRule).where(models.CategorizationRule.user_id == user.id),
+            delete(models.Subscription).where(models.Subscription.user_id == user.id),
+            delete(models.Goal).where(models.Goal.user_id == user.id),
+            # Budget limits before buckets
+            delete(models.BudgetLimit).where(models.BudgetLimit.bucket_id.in_(bucket_ids)),
+            delete(models.BudgetBucket).where(models.BudgetBucket.user_id == user.id),
+            # Account-related data
+            delete(models.InvestmentHolding).where(models.InvestmentHolding.account_id.in_(account_ids)),
+            delete(models.Account).where(models.Account.user_id == user.id),
+            delete(models.HouseholdMember).where(models.HouseholdMember.user_id == user.id),
+            delete(models.NetWorthSnapshot).where(models.NetWorthSnapshot.user_id == user.id),
+            delete(models.User).where(models.User.id == user.id),
+        ]
+        for stmt in statements:
+            db.execute(stmt.execution_options(synchronize_session=False))
         print("Existing demo user removed.")
 
 
+def hash_demo_password() -> str:
+    """Hash the demo password. SEED_FAST=1 uses the minimum argon2 cost."""
+    from backend.auth import get_password_hash
+    from passlib.hash import argon2
+    if os.getenv("SEED_FAST") == "1":
+        # Still argon2 so the app's CryptContext can verify it
+        return argon2.using(time_cost=1, memory_cost=8192, parallelism=1).hash(DEMO_PASSWORD)
+    return get_password_hash(DEMO_PASSWORD)
+
+
 def create_demo_user(db: Session) -> models.User:
     """Create the demo user account."""
+    from backend import models
     print("Creating demo user...")
     user = models.User(
         email=DEMO_EMAIL,
-        hashed_password=get_password_hash(DEMO_PASSWORD),
+        hashed_password=hash_demo_password(),
         name=DEMO_NAME,
         currency_symbol="$",
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     print(f"Created demo user: {DEMO_EMAIL} (ID: {user.id})")
     return user
 
 
 def create_members(db: Session, user_id: int) -> list:
     """Create household members."""
+    from backend import models
     print("Creating household members...")
     members = []
     for m in MEMBERS:
@@ -260,82 +305,75 @@ def create_members(db: Session, user_id: int) -> list:
         )
         db.add(member)
         members.append(member)
-    db.commit()
-    for m in members:
-        db.refresh(m)
+    db.flush()
     print(f"Created {len(members)} household members")
     return members
 
 
 def create_categories(db: Session, user_id: int) -> dict:
     """Create hierarchical budget categories. Returns dict mapping name to bucket."""
+    from backend import models
     print("Creating budget categories...")
-    bucket_map = {}
-    display_order = 0
     
-    for cat in CATEGORIES:
-        # Create parent category
-        parent = models.BudgetBucket(
-            user_id=user_id,
-            name=cat["name"],
-            icon_name=cat.get("icon", "Wallet"),
-            group=cat.get("group", "Discretionary"),
-            is_shared=cat.get("is_shared", False),
-            is_transfer=cat.get("is_transfer", False),
-            is_investment=cat.get("is_investment", False),
-            display_order=display_order,
-        )
-        db.add(parent)
-        db.commit()
-        db.refresh(parent)
-        bucket_map[cat["name"]] = parent
-        display_order += 1
-        
-        # Create children if any
-        if "children" in cat:
-            child_order = 0
-            for child in cat["children"]:
-                child_bucket = models.BudgetBucket(
-                    user_id=user_id,
-                    name=child["name"],
-                    icon_name=child.get("icon", "Circle"),
-                    group=cat.get("group", "Discretionary"),
-                    is_shared=cat.get("is_shared", False),
-                    parent_id=parent.id,
-                    display_order=child_order,
-                )
-                db.add(child_bucket)
-                db.commit()
-                db.refresh(child_bucket)
-                bucket_map[child["name"]] = child_bucket
-                child_order += 1
-                
-                # Add budget limit if specified
-                if child.get("limit", 0) > 0:
-                    # Add limit (will be shared between members in couple mode)
-                    limit = models.BudgetLimit(
-                        bucket_id=child_bucket.id,
-                        member_id=None,  # Shared limit
-                        amount=child["limit"],
-                    )
-                    db.add(limit)
-        
-        # Add limit for parent if no children but has limit
-        if "limit" in cat and cat["limit"] > 0 and "children" not in cat:
-            limit = models.BudgetLimit(
-                bucket_id=parent.id,
-                member_id=None,
-                amount=cat["limit"],
-            )
-            db.add(limit)
+    # Parents in one executemany; RETURNING gives back their IDs
+    parent_rows = [
+        {
+            "user_id": user_id,
+            "name": cat.name,
+            "icon_name": cat.icon,
+            "group": cat.group,
+            "is_shared": cat.is_shared,
+            "is_transfer": cat.is_transfer,
+            "is_investment": cat.is_investment,
+            "display_order": display_order,
+        }
+        for display_order, cat in enumerate(PARENT_CATEGORIES)
+    ]
+    parents = db.scalars(
+        insert(models.BudgetBucket).returning(models.BudgetBucket, sort_by_parameter_order=True),
+        parent_rows,
+    ).all()
+    bucket_map = {bucket.name: bucket for bucket in parents}
+    parent_by_name = {cat.name: cat for cat in PARENT_CATEGORIES}
+    
+    # Children resolved against the parent IDs, again in one executemany.
+    # Children inherit group and sharing from their parent.
+    child_counts = {}
+    child_rows = []
+    for child in CHILD_CATEGORIES:
+        parent = parent_by_name[child.parent]
+        child_order = child_counts.get(child.parent, 0)
+        child_counts[child.parent] = child_order + 1
+        child_rows.append({
+            "user_id": user_id,
+            "name": child.name,
+            "icon_name": child.icon,
+            "group": parent.group,
+            "is_shared": parent.is_shared,
+            "parent_id": bucket_map[child.parent].id,
+            "display_order": child_order,
+        })
+    children = db.scalars(
+        insert(models.BudgetBucket).returning(models.BudgetBucket, sort_by_parameter_order=True),
+        child_rows,
+    ).all()
+    bucket_map.update({bucket.name: bucket for bucket in children})
     
-    db.commit()
+    # Limits are shared between members in couple mode (member_id=None)
+    limit_rows = [
+        {"bucket_id": bucket.id, "member_id": None, "amount": cat.limit}
+        for bucket, cat in zip(parents + children, PARENT_CATEGORIES + CHILD_CATEGORIES)
+        if cat.limit > 0
+    ]
+    if limit_rows:
+        db.execute(insert(models.BudgetLimit), limit_rows)
     print(f"Created {len(bucket_map)} budget categories")
     return bucket_map
 
 
 def create_accounts(db: Session, user_id: int) -> dict:
     """Create bank and investment accounts."""
+    from backend import models
     print("Creating accounts...")
     account_map = {}
     
@@ -348,254 +386,306 @@ def create_accounts(db: Session, user_id: int) -> dict:
             balance=acc["balance"],
         )
         db.add(account)
-        db.commit()
-        db.refresh(account)
         account_map[acc["name"]] = account
     
+    db.flush()  # Account IDs are needed by holdings and goals
     print(f"Created {len(account_map)} accounts")
     return account_map
 
 
 def create_holdings(db: Session, investment_account_id: int):
     """Create investment holdings."""
+    from backend import models
     print("Creating investment holdings...")
+    holdings = []
     
     for h in HOLDINGS:
         exchange_rate = 1.55 if h.get("currency") == "USD" else 1.0
         value = h["quantity"] * h["price"] * exchange_rate
         
-        holding = models.InvestmentHolding(
-            account_id=investment_account_id,
-            ticker=h["ticker"],
-            name=h["name"],
-            quantity=h["quantity"],
-            price=h["price"],
-            cost_basis=h.get("cost_basis"),
-            value=value,
-            currency=h.get("currency", "AUD"),
-            exchange_rate=exchange_rate,
-        )
-        db.add(holding)
+        holdings.append({
+            "account_id": investment_account_id,
+            "ticker": h["ticker"],
+            "name": h["name"],
+            "quantity": h["quantity"],
+            "price": h["price"],
+            "cost_basis": h.get("cost_basis"),
+            "value": value,
+            "currency": h.get("currency", "AUD"),
+            "exchange_rate": exchange_rate,
+        })
     
-    db.commit()
+    db.bulk_insert_mappings(models.InvestmentHolding, holdings)
     print(f"Created {len(HOLDINGS)} investment holdings")
 
 
-def create_goals(db: Session, user_id: int, savings_account_id: int):
+def create_goals(db: Session, user_id: int, savings_account_id: int, now: datetime):
     """Create savings goals."""
+    from backend import models
     print("Creating goals...")
+    goals = []
     
     for g in GOALS:
         # Set target date based on progress
         progress = g["current"] / g["target_amount"]
         if progress >= 0.8:
-            target_date = datetime.now() + timedelta(days=90)
+            target_date = now + timedelta(days=90)
         elif progress >= 0.4:
-            target_date = datetime.now() + timedelta(days=365)
+            target_date = now + timedelta(days=365)
         else:
-            target_date = datetime.now() + timedelta(days=730)
+            target_date = now + timedelta(days=730)
         
-        goal = models.Goal(
-            user_id=user_id,
-            name=g["name"],
-            target_amount=g["target_amount"],
-            target_date=target_date.date(),
-            linked_account_id=savings_account_id,
-        )
-        db.add(goal)
+        goals.append({
+            "user_id": user_id,
+            "name": g["name"],
+            "target_amount": g["target_amount"],
+            "target_date": target_date.date(),
+            "linked_account_id": savings_account_id,
+        })
     
-    db.commit()
+    db.bulk_insert_mappings(models.Goal, goals)
     print(f"Created {len(GOALS)} goals")
 
 
-def create_subscriptions(db: Session, user_id: int, bucket_map: dict):
+def create_subscriptions(db: Session, user_id: int, bucket_map: dict, rng: random.Random,
+                         now: datetime):
     """Create subscription records."""
+    from backend import models
     print("Creating subscriptions...")
+    subscriptions = []
     
     for sub in SUBSCRIPTIONS:
         bucket = bucket_map.get(sub["category"])
-        subscription = models.Subscription(
-            user_id=user_id,
-            name=sub["name"],
-            amount=sub["amount"],
-            frequency=sub["frequency"],
-            bucket_id=bucket.id if bucket else None,
-            next_due_date=(datetime.now() + timedelta(days=random.randint(1, 30))).date(),
-            is_active=True,
-        )
-        db.add(subscription)
+        subscriptions.append({
+            "user_id": user_id,
+            "name": sub["name"],
+            "amount": sub["amount"],
+            "frequency": sub["frequency"],
+            "bucket_id": bucket.id if bucket else None,
+            "next_due_date": (now + timedelta(days=rng.randint(1, 30))).date(),
+            "is_active": True,
+        })
     
-    db.commit()
+    db.bulk_insert_mappings(models.Subscription, subscriptions)
     print(f"Created {len(SUBSCRIPTIONS)} subscriptions")
 
 
 def create_rules(db: Session, user_id: int, bucket_map: dict):
     """Create smart categorization rules."""
+    from backend import models
     print("Creating smart rules...")
+    rules = []
     priority = 0
     
     for rule in RULES:
         bucket = bucket_map.get(rule["category"])
         if bucket:
-            db_rule = models.CategorizationRule(
-                user_id=user_id,
-                bucket_id=bucket.id,
-                keywords=rule["keyword"],
-                priority=priority,
-            )
-            db.add(db_rule)
+            rules.append({
+                "user_id": user_id,
+                "bucket_id": bucket.id,
+                "keywords": rule["keyword"],
+                "priority": priority,
+            })
             priority += 1
     
-    db.commit()
+    db.bulk_insert_mappings(models.CategorizationRule, rules)
     print(f"Created {len(RULES)} smart rules")
 
 
-def generate_transactions(db: Session, user_id: int, bucket_map: dict, members: list):
-    """Generate 12 months of realistic transactions."""
-    print("Generating transactions...")
+def _recurring_rows(user_id: int, salary_id, rent_id, month_firsts: list) -> list:
+    """Fixed monthly transactions: salary twice a month, mortgage on the 1st."""
+    rows = []
+    if salary_id is not None:
+        rows += [
+            {
+                "user_id": user_id,
+                "date": month_first + timedelta(days=day - 1),
+                "description": "SALARY DEPOSIT - ACME CORP",
+                "raw_description": "SALARY DEPOSIT - ACME CORP",
+                "amount": 6500,  # Income is positive
+                "bucket_id": salary_id,
+                "spender": "Joint",
+                "is_verified": True,
+            }
+            for month_first in month_firsts
+            for day in (15, 28)
+        ]
+    if rent_id is not None:
+        rows += [
+            {
+                "user_id": user_id,
+                "date": month_first,
+                "description": "MORTGAGE PAYMENT - ANZ",
+                "raw_description": "MORTGAGE PAYMENT ANZ HOME LOAN",
+                "amount": -2800,  # Expense is negative
+                "bucket_id": rent_id,
+                "spender": "Joint",
+                "is_verified": True,
+            }
+            for month_first in month_firsts
+        ]
+    return rows
+
+
+def _random_rows(user_id: int, bucket_map: dict, members: list, month_firsts: list,
+                 rng: random.Random, nprng: np.random.Generator) -> list:
+    """Variable spending across the merchant categories, drawn month by month."""
+    import numpy as np
+    rows = []
+    spender_options = ["Joint", members[0].name, members[1].name]
+    bucket_id_by_name = {name: bucket.id for name, bucket in bucket_map.items()}
     
-    transactions = []
-    today = datetime.now()
-    
-    # Generate for each month
-    for months_ago in range(12, -1, -1):  # 12 months ago to now
-        month_date = today - timedelta(days=months_ago * 30)
-        
-        # Salary - twice per month
-        salary_bucket = bucket_map.get("Salary")
-        if salary_bucket:
-            for day in [15, 28]:
-                txn_date = month_date.replace(day=min(day, 28))
-                transactions.append(models.Transaction(
-                    user_id=user_id,
-                    date=txn_date,
-                    description="SALARY DEPOSIT - ACME CORP",
-                    raw_description="SALARY DEPOSIT - ACME CORP",
-                    amount=6500,  # Income is positive
-                    bucket_id=salary_bucket.id,
-                    spender="Joint",
-                    is_verified=True,
-                ))
-        
-        # Rent/Mortgage - once per month
-        rent_bucket = bucket_map.get("Rent/Mortgage")
-        if rent_bucket:
-            txn_date = month_date.replace(day=1)
-            transactions.append(models.Transaction(
-                user_id=user_id,
-                date=txn_date,
-                description="MORTGAGE PAYMENT - ANZ",
-                raw_description="MORTGAGE PAYMENT ANZ HOME LOAN",
-                amount=-2800,  # Expense is negative
-                bucket_id=rent_bucket.id,
-                spender="Joint",
-                is_verified=True,
-            ))
-        
-        # Generate random transactions for other categories
-        num_txns = random.randint(55, 75)  # Variable transactions per month
+    for month_first in month_firsts:
+        num_txns = rng.randint(55, 75)  # Variable transactions per month
         
         # Increase spending in December (holidays)
-        if month_date.month == 12:
+        if month_first.month == 12:
             num_txns = int(num_txns * 1.4)
         # Decrease in January (recovery)
-        elif month_date.month == 1:
+        elif month_first.month == 1:
             num_txns = int(num_txns * 0.7)
         
-        for _ in range(num_txns):
-            # Pick a random category with merchants
-            category = random.choice([c for c in MERCHANTS.keys() if c not in ["Salary"]])
-            merchant_options = MERCHANTS.get(category, [])
-            
-            if not merchant_options:
-                continue
-            
-            merchant_info = random.choice(merchant_options)
-            if isinstance(merchant_info, tuple):
-                description, base_amount = merchant_info
-            else:
-                description = merchant_info
-                base_amount = random.randint(10, 100)
-            
-            # Add some variance to amounts
-            variance = random.uniform(0.8, 1.3)
-            amount = round(base_amount * variance, 2)
-            
-            # Determine if expense or income
-            if category in ["Salary", "Side Income", "Investment Income"]:
-                amount = abs(amount)  # Income is positive
-            else:
-                amount = -abs(amount)  # Expense is negative
-            
-            # Random day in month
-            day = random.randint(1, 28)
-            txn_date = month_date.replace(day=day)
-            
-            # Assign to random member or Joint
-            spender_choice = random.choice(["Joint", members[0].name, members[1].name])
-            
-            bucket = bucket_map.get(category)
-            
-            transactions.append(models.Transaction(
-                user_id=user_id,
-                date=txn_date,
-                description=description,
-                raw_description=description,
-                amount=amount,
-                bucket_id=bucket.id if bucket else None,
-                spender=spender_choice,
-                is_verified=random.random() > 0.1,  # 90% verified
-            ))
+        # Draw every random attribute for the month in one call each
+        categories = rng.choices(MERCHANT_CATEGORIES, k=num_txns)
+        variances = nprng.uniform(0.8, 1.3, num_txns)
+        days = nprng.integers(1, 29, num_txns).tolist()  # Random day in month
+        spenders = rng.choices(spender_options, k=num_txns)
+        verified = (nprng.random(num_txns) > 0.1).tolist()  # 90% verified
+        merchants = [rng.choice(MERCHANTS[category]) for category in categories]
+        
+        # Amounts: vary, round, then sign by category (income positive, expenses negative)
+        base_amounts = np.array([base_amount for _, base_amount in merchants], dtype=float)
+        amounts = np.abs(np.round(base_amounts * variances, 2))
+        is_income = np.array([category in INCOME_CATEGORIES for category in categories], dtype=bool)
+        amounts = np.where(is_income, amounts, -amounts).tolist()
+        
+        for category, (description, _), amount, day, spender_choice, is_verified in zip(
+            categories, merchants, amounts, days, spenders, verified
+        ):
+            rows.append({
+                "user_id": user_id,
+                "date": month_first + timedelta(days=day - 1),
+                "description": description,
+                "raw_description": description,
+                "amount": amount,
+                "bucket_id": bucket_id_by_name.get(category),
+                "spender": spender_choice,
+                "is_verified": is_verified,
+            })
+    return rows
+
+
+def generate_transactions(db: Session, user_id: int, bucket_map: dict, members: list,
+                          rng: random.Random, nprng: np.random.Generator, now: datetime):
+    """Generate 12 months of realistic transactions."""
+    from backend import models
+    print("Generating transactions...")
     
-    # Bulk insert
-    db.bulk_save_objects(transactions)
-    db.commit()
+    # First day of each calendar month, 12 months ago to now
+    month_firsts = [
+        (now - relativedelta(months=months_ago)).replace(day=1)
+        for months_ago in range(12, -1, -1)
+    ]
+    
+    salary_bucket = bucket_map.get("Salary")
+    rent_bucket = bucket_map.get("Rent/Mortgage")
+    transactions = _recurring_rows(
+        user_id,
+        salary_bucket.id if salary_bucket else None,
+        rent_bucket.id if rent_bucket else None,
+        month_firsts,
+    )
+    transactions += _random_rows(user_id, bucket_map, members, month_firsts, rng, nprng)
+    
+    # Bulk insert (plain mappings skip ORM unit-of-work bookkeeping)
+    db.bulk_insert_mappings(models.Transaction, transactions)
     print(f"Created {len(transactions)} transactions")
 
 
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Relax SQLite durability for the seeding run."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+    except Exception as e:
+        print(f"Warning: could not apply SQLite pragmas: {e}")
+    finally:
+        cursor.close()
+
+
+def create_seed_session() -> Session:
+    """
+    Open a session on a dedicated engine tuned for a one-off batch run.
+    The app's pooled engine is left untouched.
+    """
+    from backend.database import engine
+    engine_kwargs = {"poolclass": NullPool}
+    if engine.dialect.name == "postgresql":
+        if engine.dialect.driver == "psycopg2":
+            # Batch executemany for rows that can't use insertmanyvalues
+            engine_kwargs["executemany_mode"] = "values_plus_batch"
+        if engine.url.host and "supabase.co" in engine.url.host:
+            engine_kwargs["connect_args"] = {"sslmode": "require"}
+    
+    seed_engine = create_engine(engine.url, **engine_kwargs)
+    if seed_engine.dialect.name == "sqlite":
+        event.listen(seed_engine, "connect", _apply_sqlite_pragmas)
+    
+    return sessionmaker(autocommit=False, autoflush=False, bind=seed_engine)()
+
+
 def seed_demo_user():
     """Main function to seed demo user with all data."""
+    import numpy as np
     print("\n" + "="*60)
     print("SEEDING DEMO USER")
     print("="*60 + "\n")
     
-    db = SessionLocal()
+    db = create_seed_session()
+    rng = random.Random(DEMO_SEED)
+    nprng = np.random.default_rng(DEMO_SEED)
+    now = datetime.now()  # Single reference time for every generated date
     
     try:
-        # Clear existing demo user
-        clear_demo_user(db)
-        
-        # Create demo user
-        user = create_demo_user(db)
-        
-        # Create household members
-        members = create_members(db, user.id)
-        
-        # Create budget categories
-        bucket_map = create_categories(db, user.id)
-        
-        # Create accounts
-        account_map = create_accounts(db, user.id)
-        
-        # Create investment holdings
-        investment_account = account_map.get("Investment Portfolio")
-        if investment_account:
-            create_holdings(db, investment_account.id)
-        
-        # Create goals
-        savings_account = account_map.get("Savings Account")
-        if savings_account:
-            create_goals(db, user.id, savings_account.id)
-        
-        # Create subscriptions
-        create_subscriptions(db, user.id, bucket_map)
-        
-        # Create smart rules
-        create_rules(db, user.id, bucket_map)
-        
-        # Generate transactions
-        generate_transactions(db, user.id, bucket_map, members)
-        
+        # One transaction for the whole seed: a single COMMIT at the end
+        with db.begin():
+            # Clear existing demo user
+            clear_demo_user(db)
+            
+            # Create demo user
+            user = create_demo_user(db)
+            
+            # Create household members
+            members = create_members(db, user.id)
+            
+            # Create budget categories
+            bucket_map = create_categories(db, user.id)
+            
+            # Create accounts
+            account_map = create_accounts(db, user.id)
+            
+            # Create investment holdings
+            investment_account = account_map.get("Investment Portfolio")
+            if investment_account:
+                create_holdings(db, investment_account.id)
+            
+            # Create goals
+            savings_account = account_map.get("Savings Account")
+            if savings_account:
+                create_goals(db, user.id, savings_account.id, now)
+            
+            # Create subscriptions
+            create_subscriptions(db, user.id, bucket_map, rng, now)
+            
+            # Create smart rules
+            create_rules(db, user.id, bucket_map)
+            
+            # Generate transactions
+            generate_transactions(db, user.id, bucket_map, members, rng, nprng, now)
+            
         print("\n" + "="*60)
         print("DEMO USER SEEDING COMPLETE!")
         print("="*60)
@@ -605,8 +695,8 @@ def seed_demo_user():
         print()
         
     except Exception as e:
+        # db.begin() has already rolled the transaction back
         print(f"\nError: {e}")
-        db.rollback()
         raise
     finally:
         db.close()
@@ -3,31 +3,50 @@ import sqlite3
 
 DB_PATH = "principal_v5.db"
 
+# table -> [(column, definition)]
+NEW_COLUMNS = {
+    "categorization_rules": [
+        ("apply_tags", "VARCHAR"),
+        ("mark_for_review", "BOOLEAN DEFAULT 0"),
+    ],
+    "transactions": [
+        ("tags", "VARCHAR"),
+    ],
+}
+
 def migrate():
     print(f"Connecting to {DB_PATH}...")
-    conn = sqlite3.connect(DB_PATH)
+    # Autocommit mode so the BEGIN/COMMIT below are the only transaction
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    # One-shot script: WAL + synchronous=NORMAL skips the per-commit fsync. A power
+    # loss right after the run can drop the last commit, but never corrupts the file
+    # (just re-run). Note journal_mode=WAL persists on the database file.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     cursor = conn.cursor()
     
+    # Check existing columns up front instead of letting ALTER fail
+    missing = []
+    for table, columns in NEW_COLUMNS.items():
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for col_name, col_def in columns:
+            if col_name in existing:
+                print(f"{table}.{col_name} already exists")
+            else:
+                missing.append((table, col_name, col_def))
+    
+    # All ALTERs in one transaction
+    cursor.execute("BEGIN")
     try:
-        print("Adding apply_tags column...")
-        cursor.execute("ALTER TABLE categorization_rules ADD COLUMN apply_tags VARCHAR")
-    except Exception as e:
-        print(f"Error adding apply_tags (might already exist): {e}")
-
-    try:
-        print("Adding mark_for_review column...")
-        cursor.execute("ALTER TABLE categorization_rules ADD COLUMN mark_for_review BOOLEAN DEFAULT 0")
-    except Exception as e:
-        print(f"Error adding mark_for_review (might already exist): {e}")
-
-    try:
-        print("Adding tags column to transactions...")
-        cursor.execute("ALTER TABLE transactions ADD COLUMN tags VARCHAR")
-    except Exception as e:
-        print(f"Error adding tags to transactions (might already exist): {e}")
-
-    conn.commit()
-    conn.close()
+        for table, col_name, col_def in missing:
+            print(f"Adding {col_name} column to {table}...")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_def}")
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
     print("Migration complete.")
 
 if __name__ == "__main__":
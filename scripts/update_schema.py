@@ -1,34 +1,50 @@
 import sqlite3
 
+# table -> [(column, definition)]
+NEW_COLUMNS = {
+    "accounts": [
+        ("connection_id", "VARCHAR"),
+    ],
+    "transactions": [
+        ("external_id", "VARCHAR"),
+        ("account_id", "INTEGER REFERENCES accounts(id)"),
+    ],
+}
+
 def migrate():
     db_path = 'principal_v5.db'
     print(f"Connecting to {db_path}...")
     try:
-        conn = sqlite3.connect(db_path)
+        # Autocommit mode so the BEGIN/COMMIT below are the only transaction
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        # One-shot script: WAL + synchronous=NORMAL skips the per-commit fsync. A power
+        # loss right after the run can drop the last commit, but never corrupts the file
+        # (just re-run). Note journal_mode=WAL persists on the database file.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
         
-        # 1. Add connection_id to accounts
-        try:
-            cursor.execute("ALTER TABLE accounts ADD COLUMN connection_id VARCHAR")
-            print("Added connection_id to accounts")
-        except Exception as e:
-            print(f"Skipping accounts (connection_id): {e}")
-            
-        # 2. Add external_id to transactions
-        try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN external_id VARCHAR")
-            print("Added external_id to transactions")
-        except Exception as e:
-            print(f"Skipping transactions (external_id): {e}")
-
-        # 3. Add account_id to transactions
+        # Check existing columns up front instead of letting ALTER fail
+        missing = []
+        for table, columns in NEW_COLUMNS.items():
+            existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+            for col_name, col_def in columns:
+                if col_name in existing:
+                    print(f"Skipping {table} ({col_name}): already exists")
+                else:
+                    missing.append((table, col_name, col_def))
+        
+        # All ALTERs in one transaction
+        cursor.execute("BEGIN")
         try:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN account_id INTEGER REFERENCES accounts(id)")
-            print("Added account_id to transactions")
-        except Exception as e:
-            print(f"Skipping transactions (account_id): {e}")
-
-        conn.commit()
+            for table, col_name, col_def in missing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_def}")
+                print(f"Added {col_name} to {table}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        
         conn.close()
         print("Migration complete.")
     except Exception as e:
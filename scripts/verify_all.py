@@ -0,0 +1,34 @@
+"""
+Runs every verify_* script in one process for CI smoke runs:
+    python -m scripts.verify_all
+
+The read-only checks run concurrently on the shared engine, each with its own
+session (Sessions are not thread-safe). verify_forecast writes test
+subscriptions, so it runs last, on its own, to avoid SQLite "database is locked".
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import SessionLocal
+from scripts.verify_ampersand_fix import verify_fix
+from scripts.verify_forecast import verify as verify_forecast
+from scripts.verify_income_detection import verify as verify_income_detection
+from scripts.verify_members_api import verify as verify_members_api
+
+READ_ONLY_CHECKS = [verify_fix, verify_income_detection, verify_members_api]
+
+def run_check(check):
+    db = SessionLocal()
+    try:
+        check(db=db)
+    finally:
+        db.close()
+
+def verify_all():
+    with ThreadPoolExecutor(max_workers=len(READ_ONLY_CHECKS)) as executor:
+        # list() re-raises the first failure from a worker
+        list(executor.map(run_check, READ_ONLY_CHECKS))
+    
+    run_check(verify_forecast)
+
+if __name__ == "__main__":
+    verify_all()
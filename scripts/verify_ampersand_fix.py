@@ -1,30 +1,39 @@
+from sqlalchemy import func, select
+
 from backend.database import SessionLocal
-from backend import models
+from backend import models, schemas
 import html
 
-def verify_fix():
-    db = SessionLocal()
-    user = db.query(models.User).filter(models.User.email == "david@example.com").first()
-    if not user:
-        user = db.query(models.User).first()
+def verify_fix(db=None):
+    # verify_all passes in a session; standalone runs open their own
+    if db is None:
+        db = SessionLocal()
+    # One round-trip: preferred user (else any user) plus the count of still-encoded buckets
+    remaining_count = (
+        select(func.count(models.BudgetBucket.id))
+        .where(models.BudgetBucket.name.contains("&amp;"))
+        .scalar_subquery()
+    )
+    user, remaining = db.query(models.User, remaining_count).order_by(
+        models.User.email != "david@example.com"
+    ).first()
         
     print(f"Testing with user: {user.email}")
     
     # 1. Simulate creating a bucket with encoded name directly via DB first to check baseline? 
     # No, we want to test the ROUTER logic, but we can't easily invoke router here without full FastAPI test client.
-    # Instead, let's just test that `html.unescape` works as expected in Python env
+    # Instead, check the routers' targeted unescape against the full `html.unescape`
     
     input_str = "Entertainment &amp; Dining"
-    decoded = html.unescape(input_str)
+    decoded = schemas.unescape_text(input_str)
     print(f"Input: '{input_str}' -> Decoded: '{decoded}'")
     
-    if decoded == "Entertainment & Dining":
-        print("SUCCESS: html.unescape logic is valid.")
+    if decoded == "Entertainment & Dining" == html.unescape(input_str):
+        print("SUCCESS: unescape logic is valid.")
     else:
         print("FAILURE: unescape logic failed.")
         
     # Check if any encoded buckets remain in DB
-    remaining = db.query(models.BudgetBucket).filter(models.BudgetBucket.name.contains("&amp;")).count()
     if remaining == 0:
         print("SUCCESS: Database is clean of '&amp;'.")
     else:
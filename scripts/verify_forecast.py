@@ -1,10 +1,13 @@
-from backend.database import SessionLocal, engine
+from backend.database import SessionLocal
 from backend import models
 from backend.routers.analytics import get_cash_flow_forecast
 from datetime import date, timedelta
+import pandas as pd
 
-def verify():
-    db = SessionLocal()
+def verify(db=None):
+    # verify_all passes in a session; standalone runs open their own
+    if db is None:
+        db = SessionLocal()
     user = db.query(models.User).filter(models.User.email == "david@example.com").first()
     if not user:
         user = db.query(models.User).first()
@@ -80,18 +83,16 @@ def verify():
         forecast = result['forecast']
         print(f"Forecast Points: {len(forecast)}")
         
-        # Check specific dates for events
-        salary_event_found = False
-        rent_event_found = False
+        # Check specific dates for events: one row per (date, event)
+        df = pd.DataFrame(forecast, columns=["date", "events"]).explode("events").dropna(subset=["events"])
+        events = pd.DataFrame(df["events"].tolist(), columns=["name", "amount", "type"])
+        events.insert(0, "date", df["date"].to_numpy())
         
-        for point in forecast:
-            if point['events']:
-                for e in point['events']:
-                    print(f"Date {point['date']}: Event {e['name']} (${e['amount']})")
-                    if e['name'] == "Test Salary": salary_event_found = True
-                    if e['name'] == "Test Rent": rent_event_found = True
-                    
-        if salary_event_found and rent_event_found:
+        for row in events.itertuples(index=False):
+            print(f"Date {row.date}: Event {row.name} (${row.amount})")
+        
+        found = set(events.loc[events["name"].isin(["Test Salary", "Test Rent"]), "name"])
+        if found == {"Test Salary", "Test Rent"}:
             print("SUCCESS: Both Salary and Rent events detected in projection.")
         else:
             print("FAILURE: Missing events.")
@@ -2,12 +2,13 @@ from backend.database import SessionLocal
 from backend import models
 from backend.routers.analytics import get_suggested_subscriptions
 
-def verify():
-    db = SessionLocal()
+def verify(db=None):
+    # verify_all passes in a session; standalone runs open their own
+    if db is None:
+        db = SessionLocal()
     # Mock user object
-    user = db.query(models.User).filter(models.User.email == "david@example.com").first()
-    if not user:
-        user = db.query(models.User).first()
+    # Preferred user sorts first, so one query covers the fallback too
+    user = db.query(models.User).order_by(models.User.email != "david@example.com").first()
         
     print(f"Testing with user: {user.email}")
     
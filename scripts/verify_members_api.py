@@ -1,25 +1,22 @@
-import requests
-import json
-
-BASE_URL = "http://localhost:8000"
-# Assuming auth is required, we need to login or mock it.
-# Easier to test via direct database access for verifying migration success, 
-# but testing API response structure is crucial here.
-# I'll rely on DB verification for now as it's simpler without auth token dance in script.
+# Verifies the members/limits migration directly against the database
+# (no HTTP round-trip or auth token needed).
+from sqlalchemy.orm import selectinload
 
 from backend.database import SessionLocal
 from backend import models
 
-def verify():
-    db = SessionLocal()
-    user = db.query(models.User).filter(models.User.email == "david@example.com").first()
-    if not user:
-        user = db.query(models.User).first()
+def verify(db=None):
+    # verify_all passes in a session; standalone runs open their own
+    if db is None:
+        db = SessionLocal()
+    # Preferred user sorts first, so one query covers the fallback too
+    user = db.query(models.User).order_by(models.User.email != "david@example.com").first()
         
     print(f"Verifying for user: {user.email}")
     
     # 1. Verify Members
     members = db.query(models.HouseholdMember).filter(models.HouseholdMember.user_id == user.id).all()
+    member_name_by_id = {m.id: m.name for m in members}
     print(f"Found {len(members)} members:")
     for m in members:
         print(f" - {m.name} (Color: {m.color})")
@@ -30,17 +27,19 @@ def verify():
 
     # 2. Verify Limits
     # Pick a bucket that had limits
-    bucket = db.query(models.BudgetBucket).filter(
+    bucket = db.query(models.BudgetBucket).options(
+        selectinload(models.BudgetBucket.limits)
+    ).filter(
         models.BudgetBucket.user_id == user.id, 
         models.BudgetBucket.name.in_(["Rent", "Rent/Mortgage", "Groceries"])
     ).first()
     
     if bucket:
         print(f"\nChecking bucket: {bucket.name} (ID: {bucket.id})")
-        limits = db.query(models.BudgetLimit).filter(models.BudgetLimit.bucket_id == bucket.id).all()
+        limits = bucket.limits
         print(f"Found {len(limits)} limits:")
         for l in limits:
-            m_name = next((m.name for m in members if m.id == l.member_id), "Unknown")
+            m_name = member_name_by_id.get(l.member_id, "Unknown")
             print(f" - {m_name}: ${l.amount}")
             
         if len(limits) > 0:
@@ -1,3 +1,4 @@
+import json
 import sys
 sys.path.append('.')
 
@@ -6,29 +7,31 @@ from backend import models
 from backend.schemas import BudgetBucket
 from pydantic import TypeAdapter
 
+# Build the schema once at import time; construction is far costlier than a dump
+BUCKET_ADAPTER = TypeAdapter(BudgetBucket)
+
 db = SessionLocal()
 
 # Get a bucket with an ampersand
-bucket = db.query(models.BudgetBucket).filter(
-    models.BudgetBucket.name.like('%&%')
-).first()
+bucket = db.query(models.BudgetBucket).filter(models.BudgetBucket.name.contains('&')).first()
 
 if bucket:
     print(f"Database value: {bucket.name}")
     
     # Serialize using Pydantic schema (simulating API response)
-    adapter = TypeAdapter(BudgetBucket)
-    bucket_dict = adapter.dump_python(bucket, mode='json')
+    # dump_json emits the response body in one pass, as FastAPI would send it
+    bucket_json = BUCKET_ADAPTER.dump_json(bucket)
+    api_name = json.loads(bucket_json)['name']
     
-    print(f"API response value: {bucket_dict['name']}")
+    print(f"API response value: {api_name}")
     
-    if bucket.name == bucket_dict['name']:
+    if bucket.name == api_name:
         print("\n✅ SUCCESS! Ampersands are displayed correctly")
         print(f"   Both show: '{bucket.name}'")
     else:
         print("\n❌ STILL BROKEN:")
         print(f"   Database: '{bucket.name}'")
-        print(f"   API: '{bucket_dict['name']}'")
+        print(f"   API: '{api_name}'")
 else:
     print("No buckets with & found")
 
@@ -1,5 +1,12 @@
+from __future__ import annotations
+
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+# Pooled session; closed once the registration check finishes
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 BASE_URL = "http://localhost:8000"
 
@@ -10,11 +17,14 @@ def test_register():
         "password": "password123"
     }
     try:
-        response = requests.post(f"{BASE_URL}/auth/register", json=payload)
+        response = SESSION.post(f"{BASE_URL}/auth/register", json=payload)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
     except Exception as e:
         print(f"Request Failed: {e}")
 
 if __name__ == "__main__":
-    test_register()
+    try:
+        test_register()
+    finally:
+        SESSION.close()
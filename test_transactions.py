@@ -1,10 +1,10 @@
-import requests
+import httpx
 
 url = "http://localhost:8000/transactions/"
 
 try:
     print("Testing /transactions/...")
-    response = requests.get(url)
+    response = httpx.get(url)
     
     if response.status_code == 200:
         data = response.json()
@@ -7,78 +7,209 @@ Provides shared fixtures for all tests including:
 - Authentication helpers
 """
 import os
+import sqlite3
 import sys
+import tempfile
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
+from passlib.context import CryptContext
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Point the app's own engine at a throwaway file, so importing backend.main
+# (create_all + auto-migrations) never touches the tracked dev database
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="principal-tests-"), "app.db"),
+)
+
+# Opt-in auth caches, enabled for the test process (read at import)
+os.environ.setdefault("AUTH_VERIFY_CACHE", "1")
+os.environ.setdefault("AUTH_JWT_CACHE_TTL", "300")
+
 from backend.database import Base, get_db
 from backend import models, auth
 
 
+# ============================================
+# PASSWORD HASHING
+# ============================================
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Swap in a minimum-cost Argon2 context for the test session.
+    Production cost makes every hash/verify take ~0.2s; hashes stay valid argon2.
+    """
+    original = auth.pwd_context
+    auth.pwd_context = CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=1,
+        argon2__memory_cost=8,
+        argon2__parallelism=1,
+    )
+    yield
+    auth.pwd_context = original
+
+
 # ============================================
 # DATABASE FIXTURES
 # ============================================
 
+@pytest.fixture(scope="session")
+def pristine_schema():
+    """
+    In-memory SQLite database holding the empty schema, built once per session.
+    Tests copy it with the backup API instead of re-running create_all.
+    """
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    pristine = sqlite3.connect(":memory:", check_same_thread=False)
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.backup(pristine)
+    finally:
+        raw.close()
+    engine.dispose()
+    yield pristine
+    pristine.close()
+
+
 @pytest.fixture(scope="function")
-def test_engine():
-    """Create an in-memory SQLite engine for testing."""
+def test_engine(pristine_schema):
+    """
+    Private in-memory SQLite engine restored from the pristine schema, for tests that
+    need their own sessions (e.g. concurrent requests) rather than the shared db_session.
+    """
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    raw = engine.raw_connection()
+    try:
+        pristine_schema.backup(raw.driver_connection)
+    finally:
+        raw.close()
+    yield engine
+    # The database lives only in the pooled connection; disposing discards it
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def session_engine(tmp_path_factory):
+    """
+    File-backed SQLite engine whose schema is created once for the whole test session.
+    Each pytest-xdist worker gets its own file; WAL lets readers proceed while a test writes.
+    """
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # pysqlite manages BEGIN itself and breaks SAVEPOINT; let SQLAlchemy emit it
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
-def test_db(test_engine):
-    """Create a database session for testing."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-    db = TestingSessionLocal()
+def db_session(session_engine):
+    """
+    Session bound to an outer transaction that is rolled back after the test.
+    commit() from the test or the app only releases a SAVEPOINT.
+    """
+    connection = session_engine.connect()
+    trans = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     try:
-        yield db
+        yield session
     finally:
-        db.close()
+        session.close()
+        trans.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """One TestClient (and app startup) shared by the whole test session."""
+    from backend.main import app
+    
+    with TestClient(app, raise_server_exceptions=False) as c:
+        yield c
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
-    """Create a FastAPI TestClient with test database and disabled rate limiting."""
-    # Import app after patching to get the patched version
+def db_client(db_session, app_client):
+    """TestClient backed by the rollback-per-test db_session."""
     from backend.main import app, limiter as main_limiter
     from backend.routers.auth import limiter as auth_limiter
     
     def override_get_db():
-        try:
-            yield test_db
-        finally:
-            pass
+        yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
-    
-    # Disable rate limiting for tests (both limiters)
     main_limiter.enabled = False
     auth_limiter.enabled = False
     
-    with TestClient(app, raise_server_exceptions=False) as c:
-        yield c
+    yield app_client
     
-    # Re-enable and clean up
     main_limiter.enabled = True
     auth_limiter.enabled = True
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def rate_limited_client(db_client):
+    """db_client with the auth router's rate limits enforced, starting from empty counters."""
+    from backend.routers.auth import limiter as auth_limiter
+    
+    auth_limiter.reset()
+    auth_limiter.enabled = True
+    yield db_client
+    auth_limiter.enabled = False
+    auth_limiter.reset()
+
+
+@pytest.fixture(scope="function")
+def test_db(db_session):
+    """
+    Database session for a test.
+    The schema is built once per session and everything the test writes is rolled back;
+    use test_engine for a fully private database (see test_settings_payload.py).
+    """
+    yield db_session
+
+
+@pytest.fixture(scope="function")
+def client(test_db, db_client):
+    """FastAPI TestClient using test_db, with rate limiting disabled."""
+    yield db_client
+
+
 # ============================================
 # USER & AUTH FIXTURES
 # ============================================
@@ -126,6 +257,16 @@ def auth_headers(auth_token):
     return {"Authorization": f"Bearer {auth_token}"}
 
 
+@pytest.fixture
+def mfa_enrolled_user(client, auth_headers):
+    """Start MFA setup for the test user; returns (secret, pyotp.TOTP) for generating codes."""
+    import pyotp
+    
+    response = client.post("/auth/mfa/setup", headers=auth_headers)
+    secret = response.json()["secret"]
+    return secret, pyotp.TOTP(secret)
+
+
 @pytest.fixture
 def unverified_user(test_db):
     """Create a user without email verification."""
@@ -163,10 +304,12 @@ def sample_bucket(test_db, test_user):
 
 @pytest.fixture
 def sample_transactions(test_db, test_user, sample_bucket):
-    """Create sample transactions for testing."""
-    transactions = []
-    for i in range(5):
-        txn = models.Transaction(
+    """
+    Create sample transactions for testing.
+    Inserted in one batch; function-scoped because several tests update or delete them.
+    """
+    transactions = [
+        models.Transaction(
             user_id=test_user.id,
             bucket_id=sample_bucket.id,
             date=datetime.now() - timedelta(days=i),
@@ -176,12 +319,11 @@ def sample_transactions(test_db, test_user, sample_bucket):
             spender="Joint",
             is_verified=True
         )
-        transactions.append(txn)
-        test_db.add(txn)
-    
+        for i in range(5)
+    ]
+    # return_defaults populates each id, so no per-row refresh is needed
+    test_db.bulk_save_objects(transactions, return_defaults=True)
     test_db.commit()
-    for txn in transactions:
-        test_db.refresh(txn)
     return transactions
 
 
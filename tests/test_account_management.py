@@ -1,47 +1,57 @@
-import requests
+from __future__ import annotations
 
-BASE_URL = "http://localhost:8000/net-worth/accounts"
+import asyncio
 
-def test_account_lifecycle():
+import httpx
+
+BASE_URL = "http://localhost:8000"
+ACCOUNTS = "/net-worth/accounts"
+
+async def account_lifecycle():
     print("Testing Account Lifecycle...")
-    
-    # 1. Create
-    print("1. Creating Temp Account...")
-    res = requests.post(BASE_URL, json={"name": "Temp Test", "type": "Asset", "category": "Other"})
-    assert res.status_code == 200
-    acc_id = res.json()["id"]
-    print(f"   Created ID: {acc_id}")
-    
-    # 2. Update
-    print("2. Updating Account...")
-    res = requests.put(f"{BASE_URL}/{acc_id}", json={
-        "name": "Updated Test", 
-        "type": "Liability", 
-        "category": "Loan",
-        "is_active": True
-    })
-    assert res.status_code == 200
-    data = res.json()
-    assert data["name"] == "Updated Test"
-    assert data["type"] == "Liability"
-    print("   Update Verified.")
-    
-    # 3. Delete
-    print("3. Deleting Account...")
-    res = requests.delete(f"{BASE_URL}/{acc_id}")
-    assert res.status_code == 200
-    print("   Delete Verified.")
-    
-    # 4. Verify Gone
-    # Fetch all and ensure not present (since default endpoint filters active=True)
-    res = requests.get(BASE_URL)
-    accounts = res.json()
-    found = any(a["id"] == acc_id for a in accounts)
-    assert not found
-    print("   Gone from list Verified.")
-    
+
+    # One keep-alive connection shared by every step
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        # 1. Create
+        print("1. Creating Temp Account...")
+        res = await client.post(ACCOUNTS, json={"name": "Temp Test", "type": "Asset", "category": "Other"})
+        assert res.status_code == 200
+        acc_id = res.json()["id"]
+        print(f"   Created ID: {acc_id}")
+
+        # 2. Update
+        print("2. Updating Account...")
+        res = await client.put(f"{ACCOUNTS}/{acc_id}", json={
+            "name": "Updated Test",
+            "type": "Liability",
+            "category": "Loan",
+            "is_active": True
+        })
+        assert res.status_code == 200
+        data = res.json()
+        assert data["name"] == "Updated Test"
+        assert data["type"] == "Liability"
+        print("   Update Verified.")
+
+        # 3. Delete
+        print("3. Deleting Account...")
+        res = await client.delete(f"{ACCOUNTS}/{acc_id}")
+        assert res.status_code == 200
+        print("   Delete Verified.")
+
+        # 4. Verify Gone
+        # Fetch all and ensure not present (since default endpoint filters active=True)
+        res = await client.get(ACCOUNTS)
+        accounts = res.json()
+        found = any(a["id"] == acc_id for a in accounts)
+        assert not found
+        print("   Gone from list Verified.")
+
     print("All Lifecycle Tests Passed!")
 
+def test_account_lifecycle():
+    asyncio.run(account_lifecycle())
+
 if __name__ == "__main__":
     try:
         test_account_lifecycle()
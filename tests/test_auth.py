@@ -79,6 +79,21 @@ class TestLogin:
             "password": "SomePassword123!"
         })
         assert response.status_code == 401
+    
+    def test_login_rate_limited(self, rate_limited_client):
+        """Repeated login attempts from one client are throttled."""
+        for _ in range(5):
+            response = rate_limited_client.post("/auth/token", data={
+                "username": "nobody@example.com",
+                "password": "WrongPassword123!"
+            })
+            assert response.status_code == 401
+        
+        response = rate_limited_client.post("/auth/token", data={
+            "username": "nobody@example.com",
+            "password": "WrongPassword123!"
+        })
+        assert response.status_code == 429
 
 
 class TestTokenRefresh:
@@ -150,6 +165,19 @@ class TestPasswordReset:
             "new_password": "NewSecurePassword123!"
         })
         assert response.status_code == 400
+    
+    def test_forgot_password_rate_limited(self, rate_limited_client):
+        """Repeated forgot-password requests from one client are throttled."""
+        for _ in range(5):
+            response = rate_limited_client.post("/auth/forgot-password", json={
+                "email": "doesnotexist@example.com"
+            })
+            assert response.status_code == 200
+        
+        response = rate_limited_client.post("/auth/forgot-password", json={
+            "email": "doesnotexist@example.com"
+        })
+        assert response.status_code == 429
 
 
 class TestEmailVerification:
@@ -320,10 +348,11 @@ class TestMFA:
         # Check for issuer (may be URL-encoded)
         assert "Principal" in data["provisioning_uri"]
     
-    def test_mfa_verify_invalid_code(self, client, auth_headers):
+    def test_mfa_verify_invalid_code(self, client, auth_headers, test_db, test_user):
         """MFA verify fails with invalid code."""
-        # First setup
-        client.post("/auth/mfa/setup", headers=auth_headers)
+        # Put the user in the pending-setup state directly with a known secret
+        test_user.mfa_secret = "JBSWY3DPEHPK3PXP"
+        test_db.commit()
         
         # Try invalid code
         response = client.post("/auth/mfa/verify",
@@ -332,16 +361,11 @@ class TestMFA:
         )
         assert response.status_code == 400
     
-    def test_mfa_verify_valid_code(self, client, auth_headers, test_db, test_user):
+    def test_mfa_verify_valid_code(self, client, auth_headers, mfa_enrolled_user):
         """MFA verify succeeds with valid TOTP code."""
-        import pyotp
-        
-        # Setup MFA
-        setup_response = client.post("/auth/mfa/setup", headers=auth_headers)
-        secret = setup_response.json()["secret"]
+        _, totp = mfa_enrolled_user
         
         # Generate valid TOTP code
-        totp = pyotp.TOTP(secret)
         valid_code = totp.now()
         
         response = client.post("/auth/mfa/verify",
@@ -352,26 +376,15 @@ class TestMFA:
         data = response.json()
         assert "backup_codes" in data or "message" in data  # Response format may vary
     
-    def test_mfa_disable(self, client, test_db, test_user, test_user_data):
+    def test_mfa_disable(self, client, auth_headers, mfa_enrolled_user, test_db, test_user, test_user_data):
         """MFA can be disabled with password."""
-        import pyotp
         from backend import auth as auth_module
         from datetime import timedelta
         
-        # Create fresh token for this test
-        token = auth_module.create_access_token(
-            data={"sub": test_user_data["email"], "tv": 0},
-            expires_delta=timedelta(minutes=30)
-        )
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Setup MFA
-        setup_response = client.post("/auth/mfa/setup", headers=headers)
-        secret = setup_response.json()["secret"]
+        _, totp = mfa_enrolled_user
         
         # Verify MFA (this increments token version to 1)
-        totp = pyotp.TOTP(secret)
-        client.post("/auth/mfa/verify", headers=headers, json={"code": totp.now()})
+        client.post("/auth/mfa/verify", headers=auth_headers, json={"code": totp.now()})
         
         # Refresh the database object to get updated token_version
         test_db.refresh(test_user)
@@ -1,5 +1,13 @@
+from __future__ import annotations
+
+import orjson
 import requests
 import os
+from requests.adapters import HTTPAdapter
+
+# Keep-alive session for the upload request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 # Note: This relies on the backend verifying that buckets exist.
 # The previous phases should have seeded "Transport" and "Groceries".
@@ -19,10 +27,10 @@ try:
     with open(filepath, "rb") as f:
         print(f"Uploading {filepath}...")
         files = {"file": (filepath, f, "application/pdf")}
-        response = requests.post(url, files=files)
+        response = SESSION.post(url, files=files)
         
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)  # faster than stdlib json on large transaction lists
         print(f"Success! {len(data)} transactions.")
         
         # Check specific examples suitable for generic testing
@@ -44,3 +52,5 @@ try:
 
 except Exception as e:
     print(f"Error: {e}")
+finally:
+    SESSION.close()
@@ -1,412 +1,195 @@
-from fastapi.testclient import TestClient
-from backend.main import app
-from backend import models
-from backend.database import get_db, SessionLocal
+"""
+Principal Finance - Phase 8 Feature Tests
+
+Tests for:
+- Sinking funds (rollover buckets)
+- Smart rules
+- CSV import and split transactions
+- Calendar view
+- Subscription auditor, debt payoff and spending anomalies
+"""
+import calendar
 from datetime import datetime, timedelta
+from uuid import uuid4
 
-client = TestClient(app)
+import pytest
 
-def login():
-    response = client.post("/auth/token", data={"username": "test_script@example.com", "password": "password123"})
-    if response.status_code != 200:
-        print(f"Login failed: {response.text}")
-        return None
-    return response.json()["access_token"]
+from backend import auth, models
+from backend.main import app
 
-def test_sinking_fund(token):
-    print("\n--- Testing Sinking Funds Logic ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Create a Rollover Bucket
-    bucket_data = {
+
+@pytest.fixture
+def phase8_user(test_db, client):
+    """A user the API sees as the caller for every request in the test."""
+    user = models.User(id=str(uuid4()), email="phase8@example.com")
+    test_db.add(user)
+    test_db.commit()
+    app.dependency_overrides[auth.get_current_user] = lambda: user
+    return user
+
+
+def ingest_csv(client, name, csv_content):
+    """
+    Preview a Date/Desc/Amt CSV through /ingest/csv, then save every row via /ingest/confirm.
+    Dates are day-first, like the bank statements the importer reads.
+    """
+    preview = client.post(
+        "/ingest/csv",
+        data={"map_date": "Date", "map_desc": "Desc", "map_amount": "Amt", "spender": "Joint"},
+        files={"file": (name, csv_content, "text/csv")},
+    )
+    assert preview.status_code == 200
+    
+    confirm_fields = ("id", "bucket_id", "spender", "date", "description", "raw_description", "amount")
+    res = client.post("/ingest/confirm", json=[
+        {field: txn.get(field) for field in confirm_fields} for txn in preview.json()
+    ])
+    assert res.status_code == 200
+    return res.json()
+
+
+def test_sinking_fund(client, phase8_user):
+    """A rollover bucket's dashboard limit accumulates the unspent months of the year."""
+    res = client.post("/settings/buckets", json={
         "name": "Holiday Fund",
-        "monthly_limit_a": 100.0,
-        "is_rollover": True
-    }
-    # Assuming valid bucket creation logic exists at POST /settings/buckets?
-    # Or PUT /settings/buckets/{id} if creating fresh.
-    # Let's check settings router... usually it's POST /settings/buckets
-    
-    res = client.post("/settings/buckets", json=bucket_data, headers=headers)
-    if res.status_code != 200:
-        print(f"Failed to create bucket: {res.text}")
-        return
-        
-    bucket = res.json()
-    bid = bucket['id']
-    print(f"Created Rollover Bucket ID {bid}: {bucket['name']}")
-    
-    # 2. Add 'Past' Transactions (Jan 15 of current year)
-    # We want to verify logic calculates from start of year.
-    current_year = datetime.now().year
-    past_date = datetime(current_year, 1, 15).isoformat()
-    
-    # Simulating upload/creation via generic add? 
-    # API doesn't have generic "Add Transaction" except via splitting or upload.
-    # We can use the split endpoint to 'create' transactions if we split an existing one?
-    # OR we can inject into DB directly for this test context since we are using TestClient app.
-    # BUT TestClient app uses the REAL DB connection unless mocked. 
-    # Since we are running against real DB file, we can just use `client.post` if there is an endpoint.
-    # Wait, there is no generic POST /transactions endpoint in my plan! A gap?
-    # I usually rely on Statement Uploads.
-    # I can use Upload to ingest a transaction with specific date.
-    
-    # Alternative: Use "Split" on an existing transaction to move money into this bucket in the past?
-    # No, split inherits date.
-    
-    # Hack: I'll use direct DB injection for the test setup if possible, 
-    # OR I'll use the upload endpoint with a dummy PDF and mocking... no that's complex.
-    
-    # Let's check if I have a simple POST /transactions? 
-    # I don't think so.
-    
-    # Create via Upload with specific date text in description? No.
-    
-    # I will modify the test to just CHECK the endpoint response for a scenario I can setup?
-    # Maybe I just verify 0 spending scenario first:
-    # If I view dashboard in March, limit should be 300 (Jan+Feb+Mar).
-    
-    # Current month
-    now = datetime.now()
-    if now.month == 1:
-        print("Skipping Rollover test as it is Jan (no history).")
-        return
+        "is_rollover": True,
+        "limits": [{"amount": 100.0}]
+    })
+    assert res.status_code == 200
+    bid = res.json()["id"]
 
     # Request Dashboard for Current Month
-    start_date = now.replace(day=1).isoformat()
-    # End of month
-    import calendar
+    now = datetime.now()
     last_day = calendar.monthrange(now.year, now.month)[1]
-    end_date = now.replace(day=last_day).isoformat()
-    
-    res = client.get(f"/analytics/dashboard?start_date={start_date}&end_date={end_date}", headers=headers)
-    data = res.json()
-    
-    target_bucket = next((b for b in data['buckets'] if b['id'] == bid), None)
-    
-    expected_limit = bucket_data['monthly_limit_a'] * now.month
-    # e.g. March (3) * 100 = 300.
-    
-    print(f"Expected Limit (YTD): {expected_limit}")
-    print(f"Actual Limit in Dashboard: {target_bucket['limit']}")
-    
-    if abs(target_bucket['limit'] - expected_limit) < 0.1:
-        print("Success! Rollover logic accumulated limits correctly.")
-    else:
-        print("Failure: Rollover logic mismatch.")
-
-def test_smart_rules(token):
-    print("\n--- Testing Smart Rules ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Create a Bucket for Rule
-    bucket_res = client.post("/settings/buckets", json={"name": "Rule Target", "monthly_limit_a": 50.0}, headers=headers)
-    if bucket_res.status_code != 200:
-        print(f"Failed to create bucket: {bucket_res.text}")
-        return
-    bucket_id = bucket_res.json()['id']
-    
-    # 2. Create Rule
-    rule_data = {
+    start_date = now.replace(day=1).date().isoformat()
+    end_date = now.replace(day=last_day).date().isoformat()
+
+    res = client.get(f"/analytics/dashboard?start_date={start_date}&end_date={end_date}")
+    assert res.status_code == 200
+    target_bucket = next(b for b in res.json()["buckets"] if b["id"] == bid)
+
+    # Nothing spent this year, so every earlier month's limit rolls over into this one
+    # e.g. March: limit 100 + rollover 200 (Jan + Feb).
+    assert target_bucket["limit"] == pytest.approx(100.0)
+    assert target_bucket["rollover_amount"] == pytest.approx(100.0 * (now.month - 1))
+
+
+def test_smart_rules(client, test_db, phase8_user):
+    """Rules are created through the API and matched by the categorizer."""
+    bucket_res = client.post("/settings/buckets", json={"name": "Rule Target"})
+    assert bucket_res.status_code == 200
+    bucket_id = bucket_res.json()["id"]
+
+    res = client.post("/settings/rules/", json={
         "keywords": "TESTKEYWORD",
         "bucket_id": bucket_id,
         "priority": 10
-    }
-    
-    res = client.post("/settings/rules/", json=rule_data, headers=headers)
-    if res.status_code != 200:
-        print(f"Failed to create rule: {res.text}")
-        return
-        
+    })
+    assert res.status_code == 200
     rule = res.json()
-    print(f"Created Rule ID {rule['id']} for '{rule['keywords']}' -> Bucket {bucket_id}")
-    
-    # 3. Verify Rule Logic (Direct Categorizer Test)
-    # We can't easily upload a PDF, but we can import the service if we are in the same env.
-    try:
-        from backend.services.categorizer import Categorizer
-        from backend import models
-        
-        c = Categorizer()
-        
-        # Mock Rule Object (mimic DB object)
-        class MockRule:
-            def __init__(self, k, b, p):
-                self.keywords = k
-                self.bucket_id = b
-                self.priority = p
-        
-        rules = [MockRule("TESTKEYWORD", bucket_id, 10)]
-        
-        # Test Match
-        desc = "Transaction with TESTKEYWORD inside"
-        matched_id = c.apply_rules(desc, rules)
-        
-        if matched_id == bucket_id:
-            print("Success! Categorizer.apply_rules matched correctly.")
-        else:
-            print(f"Failure: Expected {bucket_id}, got {matched_id}")
-            
-        # Test No Match
-        desc2 = "Transaction with NOTHING inside"
-        matched_id2 = c.apply_rules(desc2, rules)
-        if matched_id2 is None:
-            print("Success! Categorizer.apply_rules correctly ignored non-match.")
-        else:
-            print(f"Failure: Expected None, got {matched_id2}")
-
-    except Exception as e:
-        print(f"Skipping direct Categorizer test due to import/env issue: {e}")
-
-def test_csv_import(token):
-    print("\n--- Testing CSV Import Service ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Test CSV Parsing Logic (Direct)
-    try:
-        from backend.services.csv_service import parse_preview, process_csv
-        
-        csv_content = b"Date,Desc,Amt\n2025-01-01,Test CSV Txn,50.00\n"
-        
-        # Preview
-        preview = parse_preview(csv_content)
-        if "Date" in preview["headers"] and len(preview["rows"]) == 1:
-            print("Success! CSV Preview parsed headers and rows.")
-        else:
-            print(f"Failure: Preview mismatch. {preview}")
-            
-        # Process
-        mapping = {"date": "Date", "description": "Desc", "amount": "Amt"}
-        txns = process_csv(csv_content, mapping)
-        
-        if len(txns) == 1 and txns[0]["amount"] == 50.0:
-            print("Success! CSV Processing mapped columns correctly.")
-        else:
-            print(f"Failure: Processing mismatch. {txns}")
-            
-    except Exception as e:
-        print(f"Skipping direct CSV test due to import/env issue: {e}")
-
-    except Exception as e:
-        print(f"Skipping direct CSV test due to import/env issue: {e}")
-
-def test_split_transactions(token):
-    print("\n--- Testing Split Transactions ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Create a dummy transaction via split logic (hacky but works if we split nothing?)
-    # Easier: Find an existing transaction or just rely on logic.
-    # We really need a transaction to split. 
-    # Let's use the CSV process to ingest one first? Or just inject mock.
-    # Since we have CSV Import service working, let's use the CSV endpoint to create a txn!
-    # That verifies endpoint integration too.
-    
-    csv_content = b"Date,Desc,Amt\n2025-06-01,To Be Split,100.00\n"
-    files = {"file": ("split_test.csv", csv_content, "text/csv")}
-    data = {
-        "map_date": "Date",
-        "map_desc": "Desc",
-        "map_amount": "Amt",
-        "spender": "Joint"
-    }
-    
-    res = client.post("/ingest/csv", data=data, files=files, headers=headers)
-    if res.status_code != 200:
-        print(f"Failed to ingest seed txn: {res.text}")
-        return
-        
-    txns = res.json()
-    if not txns:
-        print("No transactions created to split.")
-        return
-        
-    parent_id = txns[0]['id']
-    print(f"Created Parent Transaction {parent_id} for $100.00")
-    
-    # 2. Split it
+    assert rule["keywords"] == "TESTKEYWORD"
+    assert rule["bucket_id"] == bucket_id
+
+    # Categorizer against the stored rule
+    from backend.services.categorizer import Categorizer
+
+    c = Categorizer()
+    rules = [test_db.get(models.CategorizationRule, rule["id"])]
+
+    matched = c.apply_rules("Transaction with TESTKEYWORD inside", rules)
+    assert matched is not None
+    assert matched.bucket_id == bucket_id
+
+    assert c.apply_rules("Transaction with NOTHING inside", rules) is None
+
+
+def test_csv_import():
+    """CSV preview and processing map the configured columns."""
+    from backend.services.csv_service import parse_preview, process_csv
+
+    csv_content = b"Date,Desc,Amt\n2025-01-01,Test CSV Txn,50.00\n"
+
+    preview = parse_preview(csv_content)
+    assert "Date" in preview["headers"]
+    assert len(preview["rows"]) == 1
+
+    mapping = {"date": "Date", "description": "Desc", "amount": "Amt"}
+    txns = process_csv(csv_content, mapping)
+    assert len(txns) == 1
+    assert txns[0]["amount"] == 50.0
+
+
+def test_split_transactions(client, phase8_user):
+    """A transaction ingested from CSV splits into children that sum to the original."""
+    txns = ingest_csv(client, "split_test.csv", b"Date,Desc,Amt\n01/06/2025,To Be Split,100.00\n")
+    assert len(txns) == 1
+    parent_id = txns[0]["id"]
+
+    bucket_res = client.post("/settings/buckets", json={"name": "Split Target"})
+    assert bucket_res.status_code == 200
+    bid = bucket_res.json()["id"]
+
     # Split $100 into $60 and $40
-    # First need a bucket. Let's reuse 'Rule Target' bucket (from previous test) or any bucket.
-    # We'll just pick bucket_id 1 (usually exists) or fetch one.
-    b_res = client.get("/settings/buckets", headers=headers)
-    buckets = b_res.json()
-    bid = buckets[0]['id'] if buckets else 1
-    
-    split_payload = {
+    split_res = client.post(f"/transactions/{parent_id}/split", json={
         "items": [
             {"amount": 60.0, "description": "Split Part A", "bucket_id": bid, "date": "2025-06-01T00:00:00"},
             {"amount": 40.0, "description": "Split Part B", "bucket_id": bid, "date": "2025-06-01T00:00:00"}
         ]
-    }
-    
-    split_res = client.post(f"/transactions/{parent_id}/split", json=split_payload, headers=headers)
-    
-    if split_res.status_code == 200:
-        children = split_res.json()
-        if len(children) == 2 and children[0]['amount'] + children[1]['amount'] == 100.0:
-            print("Success! Transaction split into children correctly.")
-            print(f"Child 1: {children[0]['amount']}, Child 2: {children[1]['amount']}")
-        else:
-            print(f"Failure: Unexpected split result: {children}")
-    else:
-        print(f"Failure: Split API error: {split_res.text}")
-
-def test_calendar_view(token):
-    print("\n--- Testing Calendar View ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Fetch range that covers the split txn we just made (June 2025)
-    start = "2025-06-01"
-    end = "2025-06-30"
-    
-    res = client.get(f"/analytics/calendar?start_date={start}&end_date={end}", headers=headers)
-    
-    if res.status_code == 200:
-        data = res.json()
-        # Should contain at least the split children (since parent is likely container/hidden? 
-        # Wait, implementation of split kept parent as verified? 
-        # Actually logic was: Parent is marked verify.
-        # Calendar endpoint returns ALL transactions in range.
-        # If split logic hides parent, we might see all.
-        # Let's just verify we get a list.
-        if isinstance(data, list):
-            print(f"Success! Calendar endpoint returned {len(data)} transactions.")
-        else:
-            print("Failure: Calendar returned invalid format.")
-    else:
-        print(f"Failure: Calendar API error: {res.text}")
-
-
-
-def test_subscription_auditor(token):
-    print("\n--- Testing Subscription Auditor ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Seed Recurring Transactions via CSV
-    # We need at least 3 months of data.
-    csv_content = b"Date,Desc,Amt\n2025-09-15,Netflix Premium,-20.00\n2025-10-15,Netflix Premium,-20.00\n2025-11-15,Netflix Premium,-20.00\n"
-    
-    files = {"file": ("sub_test.csv", csv_content, "text/csv")}
-    data = {
-        "map_date": "Date",
-        "map_desc": "Desc",
-        "map_amount": "Amt",
-        "spender": "Joint"
-    }
-    
-    print("Seeding recurring transactions...")
-    res = client.post("/ingest/csv", data=data, files=files, headers=headers)
-    if res.status_code != 200:
-        print(f"Failed to seed data: {res.text}")
-        return
-        
-    # 2. Call Analytics Endpoint
-    sub_res = client.get("/analytics/subscriptions", headers=headers)
-    if sub_res.status_code != 200:
-        print(f"Failed to fetch subscriptions: {sub_res.text}")
-        return
-        
-    subs = sub_res.json()
-    
-    # 3. Verify Detection
-    netflix = next((s for s in subs if "Netflix" in s['name']), None)
-    
-    if netflix:
-        print(f"Success! Detected subscription: {netflix['name']}")
-        print(f"Frequency: {netflix['frequency']}, Amount: {netflix['amount']}")
-        if netflix['frequency'] == 'Monthly' and abs(netflix['amount'] - 20.0) < 0.1:
-            print("Verification Passed: Correctly identified Monthly $20.00 subscription.")
-        else:
-            print(f"Verification Warning: Detected but details mismatch. {netflix}")
-    else:
-        print("Failure: Did not detect Netflix subscription.")
-        print(f"Found: {[s['name'] for s in subs]}")
-
-def test_debt_payoff(token):
-    print("\n--- Testing Debt Payoff Visualizer ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Test Parameters
-    params = {
+    })
+    assert split_res.status_code == 200
+    children = split_res.json()
+    assert sorted(child["amount"] for child in children) == [40.0, 60.0]
+    assert all(child["bucket_id"] == bid for child in children)
+
+
+def test_calendar_view(client, phase8_user):
+    """The calendar returns the transactions inside the requested range."""
+    ingest_csv(client, "calendar_test.csv", b"Date,Desc,Amt\n10/06/2025,Calendar Txn,-25.00\n10/07/2025,Outside Range,-5.00\n")
+
+    res = client.get("/analytics/calendar?start_date=2025-06-01&end_date=2025-06-30")
+    assert res.status_code == 200
+    data = res.json()
+    assert [t["description"] for t in data] == ["Calendar Txn"]
+
+
+def test_subscription_auditor(client, phase8_user):
+    """Three monthly payments of the same amount are suggested as a subscription."""
+    today = datetime.now().date()
+    rows = "".join(
+        f"{(today - timedelta(days=30 * months_ago)).strftime('%d/%m/%Y')},Netflix Premium,-20.00\n"
+        for months_ago in (3, 2, 1)
+    )
+    ingest_csv(client, "sub_test.csv", ("Date,Desc,Amt\n" + rows).encode())
+
+    sub_res = client.get("/analytics/subscriptions/suggested")
+    assert sub_res.status_code == 200
+    netflix = next(s for s in sub_res.json() if "netflix" in s["name"].lower())
+    assert netflix["frequency"] == "Monthly"
+    assert netflix["amount"] == pytest.approx(20.0)
+
+
+def test_debt_payoff(client, phase8_user):
+    """Extra repayments shorten the payoff and save interest."""
+    res = client.get("/analytics/debt_projection", params={
         "current_balance": 10000.0,
         "interest_rate": 5.0, # 5%
         "minimum_payment": 500.0,
         "extra_payment": 200.0
-    }
-    
-    res = client.get("/analytics/debt_projection", params=params, headers=headers)
-    
-    if res.status_code == 200:
-        data = res.json()
-        base = data.get("base_plan", {})
-        acc = data.get("accelerated_plan", {})
-        savings = data.get("savings", {})
-        
-        # Verify basic physics
-        if base["months"] > acc["months"]:
-            print(f"Success! Accelerated plan is faster ({acc['months']} vs {base['months']} months).")
-            print(f"Interest Saved: ${savings['interest_saved']:.2f}, Time Saved: {savings['time_saved_months']} months")
-        else:
-            print("Failure: Extra payment did not reduce time.")
-            
-        if savings["interest_saved"] > 0:
-            print("Success! Interest savings calculated correctly.")
-        else:
-            print("Failure: Zero interest savings? Unlikely for 5% rate.")
-            
-    else:
-        print(f"Failure: Debt API error: {res.text}")
-
-def test_anomalies(token):
-    print("\n--- Testing Spending Anomalies ---")
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Seed Large Transaction via CSV
-    # Need date within last 30 days.
-    # Current mocked date: 2025-12-14
-    
-    csv_content = b"Date,Desc,Amt\n2025-12-10,Big Fancy TV,-600.00\n"
-    
-    files = {"file": ("anomaly_test.csv", csv_content, "text/csv")}
-    data = {
-        "map_date": "Date",
-        "map_desc": "Desc",
-        "map_amount": "Amt",
-        "spender": "Joint"
-    }
-    
-    # Ingest
-    res = client.post("/ingest/csv", data=data, files=files, headers=headers)
-    if res.status_code != 200:
-        print(f"Failed to ingest large txn: {res.text}")
-        return
-        
-    # 2. Call Anomalies Endpoint
-    res = client.get("/analytics/anomalies", headers=headers)
-    if res.status_code == 200:
-        data = res.json()
-        
-        # Verify Large Transaction
-        # Case insensitive match for safety
-        tv_alert = next((a for a in data if "Large expense" in a['message'] and "tv" in a['message'].lower()), None)
-        
-        if tv_alert:
-            print(f"Success! Detected Large Transaction Alert: {tv_alert['message']}")
-            print(f"Details: {tv_alert['details']}")
-        else:
-            print("Failure: Did not detect large transaction anomaly.")
-            print(f"Found: {[a['message'] for a in data]}")
-            
-    else:
-        print(f"Failure: Anomalies API error: {res.text}")
-
-if __name__ == "__main__":
-    token = login()
-    if token:
-        test_sinking_fund(token)
-        test_smart_rules(token)
-        test_csv_import(token)
-        test_split_transactions(token)
-        test_calendar_view(token)
-        test_subscription_auditor(token)
-        test_debt_payoff(token)
-        test_anomalies(token)
+    })
+    assert res.status_code == 200
+    data = res.json()
+
+    assert data["base_plan"]["months"] > data["accelerated_plan"]["months"]
+    assert data["savings"]["interest_saved"] > 0
+    assert data["savings"]["time_saved_months"] == data["base_plan"]["months"] - data["accelerated_plan"]["months"]
+
+
+def test_anomalies(client, phase8_user):
+    """A large recent expense is reported as an anomaly."""
+    recent = (datetime.now().date() - timedelta(days=4)).strftime("%d/%m/%Y")
+    ingest_csv(client, "anomaly_test.csv", f"Date,Desc,Amt\n{recent},Big Fancy TV,-600.00\n".encode())
+
+    res = client.get("/analytics/anomalies")
+    assert res.status_code == 200
+    messages = [a["message"] for a in res.json()]
+    assert any("Large expense" in m and "tv" in m.lower() for m in messages), messages
@@ -58,6 +58,13 @@ class TestInputSanitization:
     def test_sanitize_none_input(self):
         """None input returns None."""
         assert sanitize_string(None) is None
+    
+    def test_unescape_text_inverts_sanitize_text(self):
+        """Targeted unescape restores exactly what sanitize_text escaped."""
+        from backend.schemas import sanitize_text, unescape_text
+        
+        for original in ["Entertainment & Dining", "<b>\"Rent\"</b> & 'Bills'", "&amp;lt;", "Plain"]:
+            assert unescape_text(sanitize_text(original)) == original
 
 
 class TestValidateSafeString:
@@ -1,60 +1,73 @@
-import requests
-import json
+"""
+Principal Finance - Settings Page Payload Test
 
-BASE_URL = "http://localhost:8000"
+Replays what the settings page does: load the user and buckets together,
+then save the user settings back.
+"""
+import asyncio
 
-def test_settings_full_payload():
-    # 1. Login
-    login_payload = {"username": "test_script@example.com", "password": "password123"}
+import httpx
+import pytest
+from fastapi import Depends
+from sqlalchemy.orm import sessionmaker
+
+from backend import auth, models
+from backend.database import get_db
+from backend.main import app
+
+USER_ID = "settings-payload-user"
+
+
+@pytest.fixture
+def settings_app(test_engine):
+    """
+    App backed by a private database with one session per request:
+    the page's requests run concurrently, and a Session is not thread-safe.
+    """
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    with SessionLocal() as db:
+        db.add(models.User(id=USER_ID, email="settings@example.com", currency_symbol="AUD"))
+        db.add(models.BudgetBucket(user_id=USER_ID, name="Groceries", group="Discretionary"))
+        db.commit()
     
-    print("Logging in...")
-    try:
-        resp = requests.post(f"{BASE_URL}/auth/token", data=login_payload)
-        if resp.status_code != 200:
-            print(f"Login Failed: {resp.text}")
-            return
-        
-        token = resp.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    def override_get_current_user(db=Depends(get_db)):
+        return db.get(models.User, USER_ID)
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[auth.get_current_user] = override_get_current_user
+    yield app
+    app.dependency_overrides.clear()
+
+
+async def settings_full_payload(asgi_app):
+    # Requests go straight to the app in-process; the app has no lifespan handlers to run
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://test") as client:
+        # The settings page loads the user and the buckets together
+        r_get, r_buckets = await asyncio.gather(
+            client.get("/settings/user"),
+            client.get("/settings/buckets")
+        )
+        assert r_get.status_code == 200
+        assert r_buckets.status_code == 200
+        assert [b["name"] for b in r_buckets.json()] == ["Groceries"]
         
-        # 2. Get current settings to mimic frontend "data"
-        print("Fetching settings...")
-        r_get = requests.get(f"{BASE_URL}/settings/user", headers=headers)
         current = r_get.json()
-        print(f"Current Raw: {current}")
-        
-        # 3. Construct Payload exactly like Frontend
-        # const payload = {
-        #     is_couple_mode: data.is_couple_mode,
-        #     name_a: data.name_a,
-        #     name_b: data.name_b,
-        #     currency_symbol: data.currency_symbol
-        # };
-        
-        # Simulating toggling mode
-        new_mode = not current.get('is_couple_mode')
+        new_currency = "USD" if current["currency_symbol"] != "USD" else "AUD"
         
-        payload = {
-            "is_couple_mode": new_mode,
-            "name_a": current.get("name_a"),
-            "name_b": current.get("name_b"),
-            "currency_symbol": current.get("currency_symbol")
-        }
+        r_put = await client.put("/settings/user", json={"currency_symbol": new_currency})
+        assert r_put.status_code == 200
+        assert r_put.json()["currency_symbol"] == new_currency
         
-        print(f"Sending Payload: {json.dumps(payload, indent=2)}")
-        
-        r_put = requests.put(f"{BASE_URL}/settings/user", json=payload, headers=headers)
-        with open("payload_result.txt", "w") as f:
-           f.write(f"Status: {r_put.status_code}\n")
-           f.write(f"Response: {r_put.text}\n")
-           
-        if r_put.status_code == 200:
-            print(f"Update Success. New Mode: {r_put.json().get('is_couple_mode')}")
-        else:
-            print(f"Update Failed: {r_put.status_code}")
-            
-    except Exception as e:
-        print(f"Error: {e}")
-
-if __name__ == "__main__":
-    test_settings_full_payload()
+        r_after = await client.get("/settings/user")
+        assert r_after.json()["currency_symbol"] == new_currency
+
+
+def test_settings_full_payload(settings_app):
+    asyncio.run(settings_full_payload(settings_app))
@@ -1,49 +1,22 @@
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
-import sys
-import os
+from uuid import uuid4
 
-# Add current dir to sys.path so backend imports work
-sys.path.append(os.getcwd())
-
-from sqlalchemy.pool import StaticPool
+from backend import auth
 from backend.main import app
-from backend.database import Base, get_db
 from backend.models import User, Transaction
 
-# Setup test DB
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}, 
-    poolclass=StaticPool
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-app.dependency_overrides[get_db] = override_get_db
-
-client = TestClient(app)
+SPENDER_EMAIL = "spender@example.com"
 
-def test_update_spender():
-    # 1. Init DB
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+def test_update_spender(db_session, db_client):
+    # 1. DB schema comes from the session-scoped engine; this test's writes roll back afterwards
+    db = db_session
     
     # 2. Add Test Data
-    user = User(username="testuser", name_a="A", name_b="B")
+    user = User(id=str(uuid4()), email=SPENDER_EMAIL)
     db.add(user)
     db.commit()
     db.refresh(user)
+    app.dependency_overrides[auth.get_current_user] = lambda: user
 
     txn = Transaction(
         date=datetime.now(), 
@@ -60,7 +33,7 @@ def test_update_spender():
 
     # 3. Call API
     # Note: Pydantic model TransactionUpdate expects optional fields
-    response = client.put(f"/transactions/{txn.id}", json={"spender": "User A"})
+    response = db_client.put(f"/transactions/{txn.id}", json={"spender": "User A"})
     
     if response.status_code != 200:
         print(f"Response Error: {response.text}")
@@ -75,15 +48,8 @@ def test_update_spender():
     txn_refreshed = db.query(Transaction).filter(Transaction.id == txn.id).first()
     print(f"DB State: Spender={txn_refreshed.spender}")
     assert txn_refreshed.spender == "User A"
-    
-    db.close()
-    
-if __name__ == "__main__":
-    try:
-        test_update_spender()
-        print("Test passed!")
-    except Exception as e:
-        print(f"Test Failed: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+
+def test_update_spender_rolled_back(db_session):
+    # Runs after test_update_spender: its user and transaction were rolled back
+    assert db_session.query(User).filter(User.email == SPENDER_EMAIL).count() == 0
+    assert db_session.query(Transaction).filter(Transaction.description == "Test Txn").count() == 0
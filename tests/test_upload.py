@@ -1,4 +1,4 @@
-import requests
+import httpx
 
 url = "http://localhost:8000/ingest/upload"
 filepath = "dummy_statement.pdf"
@@ -7,7 +7,7 @@ try:
     with open(filepath, "rb") as f:
         print(f"Uploading {filepath} to {url}...")
         files = {"file": (filepath, f, "application/pdf")}
-        response = requests.post(url, files=files)
+        response = httpx.post(url, files=files)
         
     if response.status_code == 200:
         print("Success! Extracted Transactions:")